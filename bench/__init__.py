@@ -0,0 +1,13 @@
+"""
+Benchmarks of the dialect, run from the repository root, e.g.
+
+    python -m bench.drivers
+
+Benchmarks with a baseline (a JSON file next to them, see bench.baseline)
+exit with status 1 when a result regressed against it.
+"""
+
+from sqlalchemy.dialects import registry
+
+registry.register("teradata", "sqlalchemy_teradata.dialect", "TeradataDialect")
+registry.register("teradata.teradatasql", "sqlalchemy_teradata.teradatasql", "TeradataDialect_teradatasql")
@@ -0,0 +1,144 @@
+"""
+Baselines of the benchmarks: the results of a run saved as JSON next to
+the benchmark, which later runs are compared with.
+
+Rates depend on the machine, so those of the timed benchmarks are divided
+by the rate of a reference workload timed along with them (see rate()),
+and the baselines hold these relative rates: they hold from one machine to
+the next as long as the dialect and SQLAlchemy run at the same speed
+relative to the reference. The relative rates of another version of
+SQLAlchemy are not compared.
+"""
+
+import gc
+import json
+import os
+import time
+
+import sqlalchemy
+from sqlalchemy import MetaData, Table, Column, Integer, String
+from sqlalchemy.engine import default
+from sqlalchemy.sql import select, bindparam
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+
+def path(name):
+    return os.path.join(_here, name + '.json')
+
+
+def load(name):
+    try:
+        with open(path(name)) as f:
+            return json.load(f)
+    except IOError:
+        return {}
+
+
+def save(name, results, digits=2):
+    with open(path(name), 'w') as f:
+        json.dump(dict((k, v if isinstance(v, str) else round(v, digits))
+                       for k, v in results.items()), f,
+                  indent=2, sort_keys=True)
+        f.write('\n')
+
+
+_REFERENCE_NUMBER = 1000
+
+
+def _reference():
+    t = Table('reference', MetaData(), Column('c1', Integer, primary_key=True),
+              Column('c2', String(20)), Column('c3', Integer))
+    stmt = select([t.c.c1, t.c.c2]).where(t.c.c3 == bindparam('c3')).order_by(t.c.c2)
+    dialect = default.DefaultDialect()
+
+    def run():
+        for i in range(_REFERENCE_NUMBER):
+            stmt.compile(dialect=dialect)
+    return run
+
+
+def rate(fn, units, repeat=5):
+    """
+    Times fn, which does units of work, and the reference workload, compiling
+    a select with the generic dialect of SQLAlchemy, in turn repeat times so
+    that both run at the same speed of the machine. Returns the best rate of
+    fn per second and its median rate relative to that of the reference, for
+    report(relative=True).
+    """
+    reference = _reference()
+    times = []
+    # as timeit does, the collections of the garbage collector are left out
+    gc.disable()
+    try:
+        for i in range(repeat):
+            start = time.time()
+            fn()
+            elapsed = time.time() - start
+
+            start = time.time()
+            reference()
+            times.append((max(elapsed, 1e-9), max(time.time() - start, 1e-9)))
+    finally:
+        gc.enable()
+
+    ratios = sorted(units * ref / (_REFERENCE_NUMBER * elapsed) for elapsed, ref in times)
+    return units / min(elapsed for elapsed, ref in times), ratios[len(ratios) // 2]
+
+
+def regressions(results, baseline, tolerance, higher_is_better=True):
+    """
+    Returns (key, result, baseline) for every result worse than its
+    baseline by more than tolerance (a fraction of the baseline).
+    """
+    res = []
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+        value, base = results[key], baseline[key]
+        if higher_is_better:
+            worse = value < base * (1 - tolerance)
+        else:
+            worse = value > base * (1 + tolerance)
+        if worse:
+            res.append((key, value, base))
+    return res
+
+
+def report(name, results, save_baseline=False, tolerance=0.25, higher_is_better=True,
+           fmt='{:>14,.0f}', relative=False):
+    """
+    Prints results next to the baseline of name and returns the exit
+    status of the run: 1 when a result regressed, else 0. With
+    save_baseline the results become the new baseline. With relative,
+    the results are the (rate, relative rate) pairs of rate(), compared
+    by their relative rates.
+    """
+    baseline = load(name)
+    compared = results
+    if relative:
+        compared = dict((k, rel) for k, (v, rel) in results.items())
+        results = dict((k, v) for k, (v, rel) in results.items())
+        version = '.'.join(sqlalchemy.__version__.split('.')[:2])
+        if baseline.get('sqlalchemy', version) != version:
+            print('The baseline is of SQLAlchemy {}, not compared under {}'.format(
+                    baseline['sqlalchemy'], version))
+            baseline = {}
+    for key in sorted(results):
+        base = baseline.get(key)
+        change = '' if not base else '{:+7.1%}'.format(compared[key] / float(base) - 1)
+        print('{:40} {} {}'.format(key, fmt.format(results[key]), change))
+
+    if save_baseline:
+        if relative:
+            compared = dict(compared, sqlalchemy=version)
+        save(name, compared, digits=4 if relative else 2)
+        return 0
+
+    failed = regressions(compared, baseline, tolerance, higher_is_better)
+    if relative:
+        fmt = '{:.4f} of the reference'
+    for key, value, base in failed:
+        print('REGRESSION {}: {} against a baseline of {}'.format(
+                key, fmt.format(value).strip(), fmt.format(base).strip()))
+    return 1 if failed else 0
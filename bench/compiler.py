@@ -0,0 +1,140 @@
+"""
+Compiler throughput, in statements (or types) compiled per second, of
+TeradataCompiler (selects with TOP), TeradataDDLCompiler (CREATE TABLE with
+TDCreateTablePostfix and TDCreateTablePost options, through a mock engine)
+and every visitor of TeradataTypeCompiler.
+
+Rates are compared, relative to the reference rate of the run (see
+bench.baseline), with the baseline in bench/compiler.json and the run fails
+when one of them drops by more than the tolerance; --save records a new
+baseline.
+
+    python -m bench.compiler [--save] [--tolerance 0.25] [--number 2000]
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import (create_engine, MetaData, Table, Column, Integer, String, Numeric,
+                        SmallInteger, BigInteger, Boolean, Float, Date, DateTime, Time,
+                        Text, Unicode, UnicodeText, LargeBinary)
+from sqlalchemy import types as sqltypes
+from sqlalchemy.sql import select, func, bindparam
+from sqlalchemy_teradata import types as tdtypes
+from sqlalchemy_teradata.compiler import TDCreateTablePost, TDCreateTablePostfix
+from bench import baseline
+
+
+def _compile(sql, *multiparams, **params):
+    sql.compile(dialect=dialect)
+
+try:
+    from sqlalchemy import create_mock_engine
+    engine = create_mock_engine('teradata://', _compile)
+except ImportError:
+    engine = create_engine('teradata://', strategy='mock', executor=_compile)
+dialect = engine.dialect
+
+meta = MetaData()
+t1 = Table('t1', meta, Column('c1', Integer, primary_key=True), Column('c2', String(20)),
+           Column('c3', Numeric(12, 2)), Column('c4', DateTime))
+t2 = Table('t2', meta, Column('c1', Integer), Column('c2', Unicode(40)))
+
+SELECTS = {
+    'select.top': select([t1]).where(t1.c.c2 == bindparam('c2')).order_by(t1.c.c1).limit(10),
+    'select.top_distinct': select([t1.c.c2]).distinct().limit(100),
+    'select.top_join': select([t1.c.c1, func.count(t2.c.c2)]).
+                            select_from(t1.join(t2, t1.c.c1 == t2.c.c1)).
+                            group_by(t1.c.c1).order_by(func.count(t2.c.c2).desc()).limit(5),
+    'select.top_subquery': select([t2]).where(t2.c.c1.in_(
+                            select([t1.c.c1]).order_by(t1.c.c3).limit(50))),
+}
+
+# every visitor of TeradataTypeCompiler, and the generic ones it inherits
+TYPES = [
+    Integer(), SmallInteger(), BigInteger(), tdtypes.BYTEINT(), Boolean(), Float(),
+    Numeric(12, 2), tdtypes.DECIMAL(18, 4), tdtypes.NUMERIC(10, 0), Date(), DateTime(),
+    DateTime(timezone=True), Time(), tdtypes.TIME(3, timezone=True),
+    tdtypes.TIMESTAMP(0), tdtypes.TIMESTAMP(6, timezone=True), String(30), String(),
+    tdtypes.VARCHAR(30, charset='LATIN'), tdtypes.CHAR(10), sqltypes.NCHAR(10),
+    sqltypes.NVARCHAR(10), Unicode(50), UnicodeText(), Text(),
+    tdtypes.CLOB(10, multiplier='K', charset='UNICODE'), LargeBinary(), tdtypes.BLOB(),
+    tdtypes.IntervalYear(4), tdtypes.IntervalYearToMonth(2), tdtypes.IntervalMonth(),
+    tdtypes.IntervalDay(3), tdtypes.IntervalDayToHour(), tdtypes.IntervalDayToMinute(2),
+    tdtypes.IntervalDayToSecond(2, 6), tdtypes.IntervalHour(), tdtypes.IntervalHourToMinute(),
+    tdtypes.IntervalHourToSecond(3, 2), tdtypes.IntervalMinute(),
+    tdtypes.IntervalMinuteToSecond(2, 4), tdtypes.IntervalSecond(2, 3),
+]
+
+
+def _table(meta, i, **kw):
+    return Table('ddl_%d' % i, meta, Column('c1', Integer, primary_key=True),
+                 Column('c2', String(50)), Column('c3', Numeric(10, 2)),
+                 Column('c4', Unicode(100), nullable=False), Column('c5', Date),
+                 Column('c6', tdtypes.TIMESTAMP(6)), **kw)
+
+
+def _metadata(tables, **kw):
+    meta = MetaData()
+    for i in range(tables):
+        _table(meta, i, **kw)
+    return meta
+
+
+DDL = {
+    'ddl.create_table': {},
+    'ddl.create_table_postfix': {'teradata_postfixes': TDCreateTablePostfix().
+                                    fallback().log().checksum('on').mergeblockratio(85).
+                                    freespace(10)},
+    'ddl.create_table_post': {'teradata_post_create': TDCreateTablePost().
+                                    primary_index('pi', unique=True, cols=['c1'])},
+    'ddl.create_table_partitioned': {'teradata_post_create': TDCreateTablePost().
+                                        no_primary_index().
+                                        partition_by_col(cols={'c2': True, 'c3': False})},
+}
+
+
+def _rate(fn, number, repeat=10):
+    """
+    The best rate of calls of fn per second, over repeat runs, and its
+    rate relative to the reference workload (see bench.baseline.rate).
+    """
+    def calls():
+        for j in range(number):
+            fn()
+    return baseline.rate(calls, number, repeat)
+
+
+def run(number=2000):
+    results = {}
+    for name, stmt in SELECTS.items():
+        results[name] = _rate(lambda: stmt.compile(dialect=dialect), number)
+
+    # CREATE TABLE statements per second, emitted by create_all()
+    tables = 50
+    for name, kw in DDL.items():
+        meta = _metadata(tables, **kw)
+        rate, relative = _rate(lambda: meta.create_all(engine, checkfirst=False),
+                               max(number // tables, 1))
+        results[name] = tables * rate, tables * relative
+
+    process = dialect.type_compiler.process
+    for type_ in TYPES:
+        results['type.' + repr(type_)] = _rate(lambda: process(type_), number * 50)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--save', action='store_true', help='save the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (default 0.25)')
+    parser.add_argument('--number', type=int, default=2000,
+                        help='compilations per timing (default 2000)')
+    args = parser.parse_args(argv)
+    return baseline.report('compiler', run(args.number), args.save, args.tolerance,
+                           relative=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
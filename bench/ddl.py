@@ -0,0 +1,101 @@
+"""
+DDL generation over a synthetic model of --tables tables (5,000) of
+--columns columns (20), whose types are drawn from the specs of a typical
+warehouse schema: CREATE TABLE statements per second emitted by
+create_all() through a mock engine, with the type DDL cache of
+TeradataTypeCompiler and without it (every type rendered each time).
+
+Rates are compared, relative to the reference rate of the run (see
+bench.baseline), with the baseline in bench/ddl.json and the run fails when
+one of them drops by more than the tolerance; --save records a new baseline.
+
+    python -m bench.ddl [--tables 5000] [--columns 20] [--save] [--tolerance 0.25]
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import (create_engine, MetaData, Table, Column, Integer, SmallInteger,
+                        BigInteger, String, Numeric, Date, DateTime, Unicode, UnicodeText)
+from sqlalchemy_teradata import types as tdtypes
+from sqlalchemy_teradata.compiler import TeradataTypeCompiler
+from bench import baseline
+
+
+def _compile(sql, *multiparams, **params):
+    sql.compile(dialect=dialect)
+
+try:
+    from sqlalchemy import create_mock_engine
+    engine = create_mock_engine('teradata://', _compile)
+except ImportError:
+    engine = create_engine('teradata://', strategy='mock', executor=_compile)
+dialect = engine.dialect
+
+
+class UncachedTypeCompiler(TeradataTypeCompiler):
+
+    def process(self, type_, **kw):
+        return type_._compiler_dispatch(self, **kw)
+
+
+# a new instance for every column, as in a declarative model
+TYPES = [
+    Integer, SmallInteger, BigInteger, tdtypes.BYTEINT, Date, DateTime,
+    lambda: Numeric(18, 2), lambda: Numeric(12, 4), lambda: tdtypes.DECIMAL(38, 0),
+    lambda: String(10), lambda: String(50), lambda: String(255),
+    lambda: tdtypes.VARCHAR(100, charset='LATIN'), lambda: tdtypes.CHAR(2),
+    lambda: Unicode(200), UnicodeText, lambda: tdtypes.TIMESTAMP(0),
+    lambda: tdtypes.TIMESTAMP(6, timezone=True), lambda: tdtypes.TIME(0),
+    lambda: tdtypes.CLOB(64, multiplier='K'), lambda: tdtypes.IntervalDay(4),
+    lambda: tdtypes.IntervalDayToSecond(2, 6),
+]
+
+
+def model(tables, columns):
+    meta = MetaData()
+    for i in range(tables):
+        Table('t%d' % i, meta, Column('id', Integer, primary_key=True),
+              *[Column('c%d' % j, TYPES[(i + j) % len(TYPES)]())
+                for j in range(columns - 1)])
+    return meta
+
+
+def _rate(meta, tables, repeat=5):
+    """
+    The best rate of CREATE TABLE statements per second, over repeat runs,
+    and its rate relative to the reference workload (see bench.baseline.rate).
+    """
+    def create_all():
+        TeradataTypeCompiler._cache.clear()
+        meta.create_all(engine, checkfirst=False)
+    return baseline.rate(create_all, tables, repeat)
+
+
+def run(tables=5000, columns=20):
+    meta = model(tables, columns)
+    results = {'create_all.cached': _rate(meta, tables)}
+
+    type_compiler = dialect.type_compiler
+    dialect.type_compiler = UncachedTypeCompiler(dialect)
+    try:
+        results['create_all.uncached'] = _rate(meta, tables)
+    finally:
+        dialect.type_compiler = type_compiler
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tables', type=int, default=5000)
+    parser.add_argument('--columns', type=int, default=20)
+    parser.add_argument('--save', action='store_true', help='save the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (default 0.25)')
+    args = parser.parse_args(argv)
+    return baseline.report('ddl', run(args.tables, args.columns), args.save, args.tolerance,
+                           relative=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Reflection cost over synthetic data dictionaries on the emulator: round
+trips, wall time and peak memory of MetaData.reflect() and of the Inspector
+methods, on a pre-16 and a 16+ server (which reflect view columns
+differently). The scenarios are
+
+    tables  --tables tables (10,000) of --columns columns (10) with a
+            primary key, a unique constraint and a secondary index each,
+            and foreign keys, and --views views (1,000)
+    wide    --wide tables (20) of --wide-columns columns (1,000)
+
+The dictionary rows are loaded straight into the emulated DBC views. Round
+trips are compared with the baseline in bench/reflection.json, and the run
+fails when they grow; --save records a new baseline.
+
+    python -m bench.reflection [--tables 10000] [--save] [--skip-reflect]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, inspect, MetaData
+from sqlalchemy_teradata import emulator
+from bench import baseline
+
+VERSIONS = ['15.10.00.00', '16.20.00.00']
+
+_COLUMN_TYPES = [('I', 4, None, None, None, '-(10)9'),
+                 ('CV', 100, 1, None, None, 'X(100)'),
+                 ('D', 8, None, 18, 2, '-(16).9(2)'),
+                 ('DA', 4, None, None, None, 'YY/MM/DD'),
+                 ('TS', 26, None, None, 6, 'YYYY-MM-DDBHH:MI:SS.S(6)')]
+
+
+def _dictionary(tables, columns, views, prefix):
+    """
+    The rows of the synthetic dictionary of database user.
+    """
+    db, now = 'user', '2017-01-01 00:00:00'
+    rows = {'TablesV': [], 'ColumnsQV': [], 'Indices': [], 'All_RI_ChildrenV': []}
+    for i in range(tables):
+        name = '%s_%d' % (prefix, i)
+        rows['TablesV'].append((db, name, 'T', now, now, None, None))
+        for c in range(columns):
+            rows['ColumnsQV'].append((db, name, 'c%d' % c, c + 1) +
+                                     _COLUMN_TYPES[c % len(_COLUMN_TYPES)] +
+                                     ('N' if c == 0 else 'Y', None, None, None, None, 'T'))
+        rows['Indices'] += [(db, name, 1, 'K', 'Y', None, 'c0', 1),
+                            (db, name, 4, 'U', 'Y', None, 'c1', 2),
+                            (db, name, 8, 'S', 'N', '%s_ix' % name, 'c2', 3),
+                            (db, name, 8, 'S', 'N', '%s_ix' % name, 'c3', 4)]
+        # every tenth table is referenced by the nine that follow it; a
+        # chain would make MetaData.reflect() recurse through all tables
+        if i % 10:
+            rows['All_RI_ChildrenV'].append((i, None, db, name, 'c4', db,
+                                             '%s_%d' % (prefix, i - i % 10), 'c0'))
+    for i in range(views):
+        name = '%s_v%d' % (prefix, i)
+        rows['TablesV'].append((db, name, 'V', now, now,
+                                'CREATE VIEW %s AS SELECT * FROM %s_%d' % (name, prefix, i),
+                                None))
+        for c in range(columns):
+            rows['ColumnsQV'].append((db, name, 'c%d' % c, c + 1) +
+                                     _COLUMN_TYPES[c % len(_COLUMN_TYPES)] +
+                                     ('Y', None, None, None, None, 'V'))
+    return rows
+
+
+def _load(engine, rows):
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        for view, values in rows.items():
+            if values:
+                cursor.executemany('INSERT INTO dbc.%s VALUES (%s)' % (
+                                        view, ', '.join('?' * len(values[0]))), values)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _operations(skip_reflect):
+    def each(method, kinds=('T',)):
+        def run(insp, names):
+            for name, kind in names:
+                if kind in kinds:
+                    getattr(insp, method)(name)
+        return run
+
+    ops = [('get_table_names', lambda insp, names: insp.get_table_names()),
+           ('get_view_names', lambda insp, names: insp.get_view_names()),
+           ('get_columns', each('get_columns', ('T', 'V'))),
+           ('get_pk_constraint', each('get_pk_constraint')),
+           ('get_indexes', each('get_indexes')),
+           ('get_unique_constraints', each('get_unique_constraints')),
+           ('get_foreign_keys', each('get_foreign_keys'))]
+    if not skip_reflect:
+        ops.append(('reflect', lambda insp, names: MetaData().reflect(insp.bind, views=True)))
+    return ops
+
+
+def _measure(engine, op, names):
+    """
+    Round trips, wall time and peak memory (MB) of op with a new Inspector.
+    """
+    emulator.stats.reset()
+    start = time.time()
+    op(inspect(engine), names)
+    elapsed = time.time() - start
+    round_trips = emulator.stats.round_trips
+
+    tracemalloc.start()
+    try:
+        op(inspect(engine), names)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round_trips, elapsed, peak / 1024.0 / 1024.0
+
+
+def run(args):
+    scenarios = [('tables%dx%d' % (args.tables, args.columns), args.tables, args.columns,
+                  args.views),
+                 ('wide%dx%d' % (args.wide, args.wide_columns), args.wide, args.wide_columns, 0)]
+    results = {}
+    for scenario, tables, columns, views in scenarios:
+        for version in VERSIONS:
+            system = 'reflection_%s_%s' % (scenario, version.split('.')[0])
+            engine = create_engine('teradata://user:pw@' + system, module=emulator,
+                                   connect_args={'version': version},
+                                   restricted_words_cache=False)
+            rows = _dictionary(tables, columns, views, scenario)
+            _load(engine, rows)
+            names = [(r[1], r[2]) for r in rows['TablesV']]
+            try:
+                for name, op in _operations(args.skip_reflect):
+                    key = '%s.v%s.%s' % (scenario, version.split('.')[0], name)
+                    results[key] = _measure(engine, op, names)
+            finally:
+                engine.dispose()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tables', type=int, default=10000)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--views', type=int, default=1000)
+    parser.add_argument('--wide', type=int, default=20)
+    parser.add_argument('--wide-columns', type=int, default=1000)
+    parser.add_argument('--skip-reflect', action='store_true',
+                        help='only time the Inspector methods')
+    parser.add_argument('--save', action='store_true', help='save the round trips as the baseline')
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print('{:40} {:>14} {:>10}'.format('', 'seconds', 'peak MB'))
+    for key in sorted(results):
+        print('{:40} {:>14.2f} {:>10.1f}'.format(key, *results[key][1:]))
+    print('\n{:40} {:>14}'.format('', 'round trips'))
+    # round trips do not depend on the machine, so only they are checked
+    return baseline.report('reflection', dict((k, v[0]) for k, v in results.items()),
+                           args.save, tolerance=0, higher_is_better=False)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
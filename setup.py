@@ -22,9 +22,12 @@ setup(
     include_package_data=True,
     tests_require=['pytest >= 2.5.2'],
     install_requires=['sqlalchemy', 'teradata'],
+    extras_require={'teradatasql': ['teradatasql']},
     entry_points={
                 'sqlalchemy.dialects': [
                            'teradata = sqlalchemy_teradata.dialect:TeradataDialect',
+                           'teradata.teradatasql = sqlalchemy_teradata.teradatasql:TeradataDialect_teradatasql',
+                           'teradata.async = sqlalchemy_teradata.aio:TeradataAsyncDialect',
                                            ]
                 }
 )
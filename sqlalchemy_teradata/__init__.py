@@ -5,7 +5,7 @@
 # This module is part of sqlalchemy-teradata and is released under
 # the MIT License: http://www.opensource.org/licenses/mit-license.php
 
-from .types import TIME, TIMESTAMP, DECIMAL, CHAR, VARCHAR, CLOB, BYTEINT
+from .types import TIME, TIMESTAMP, DECIMAL, CHAR, VARCHAR, CLOB, BLOB, BYTEINT
 from sqlalchemy.sql.sqltypes import (Integer, Interval, SmallInteger,\
                                      BigInteger, Float, Boolean,\
                                      Text, Unicode, UnicodeText,\
@@ -15,6 +15,4 @@ __version__ = '0.1.0'
 __all__ = (Integer, SmallInteger, BigInteger, Float, Text, Unicode,
            UnicodeText, Interval, Boolean,
            DATE, TIME, TIMESTAMP, DECIMAL,
-           CHAR, VARCHAR, CLOB, BYTEINT)
-
-from teradata import tdodbc
+           CHAR, VARCHAR, CLOB, BLOB, BYTEINT)
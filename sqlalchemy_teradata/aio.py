@@ -0,0 +1,293 @@
+# sqlalchemy_teradata/aio.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+asyncio support, which needs the asyncio extension of SQLAlchemy 1.4 (the
+module cannot be imported with SQLAlchemy 1.3):
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine('teradata+async://user:pw@host',
+                                 thread_pool_size=8)
+
+The Teradata driver is blocking, so each driver call is run on a thread pool
+owned by the dialect; at most thread_pool_size (default 10) calls are in
+flight at once and the event loop is never blocked. AsyncConnection.stream()
+fetches through a server side cursor, one thread hop per fetch. When the task
+awaiting a statement is cancelled, the statement is cancelled on the server
+and the connection is released once the driver call has returned.
+engine.dispose() shuts the threads of the pool down; the connections still
+checked out go on with a new pool.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy
+from sqlalchemy import event, pool
+
+try:
+    from sqlalchemy.engine import AdaptedConnection
+    from sqlalchemy.util.concurrency import await_only
+except ImportError:
+    raise ImportError('sqlalchemy_teradata.aio needs the asyncio support of SQLAlchemy 1.4, '
+                      'which SQLAlchemy %s does not have' % sqlalchemy.__version__)
+
+from sqlalchemy_teradata.base import TeradataExecutionContext, cancel_statement
+from sqlalchemy_teradata.dialect import TeradataDialect
+
+
+def _execute(cursor, operation, parameters, many):
+    # many holds the keyword arguments of an executemany, None for execute
+    if many is not None:
+        cursor.executemany(operation, parameters, **many)
+    elif parameters is None:
+        cursor.execute(operation)
+    else:
+        cursor.execute(operation, parameters)
+
+
+def _execute_buffered(cursor, operation, parameters, many):
+    """
+    Executes and fetches every result set of the request in one call.
+    """
+    _execute(cursor, operation, parameters, many)
+    results = []
+    while True:
+        description = cursor.description
+        rows = list(cursor.fetchall()) if description else []
+        results.append((description, rows, cursor.rowcount))
+        if not hasattr(cursor, 'nextset') or not cursor.nextset():
+            return results
+
+
+class AsyncAdapt_teradata_cursor(object):
+    """
+    A buffered cursor: all rows are fetched in the same thread hop
+    as the execute.
+    """
+
+    server_side = False
+
+    def __init__(self, adapt_connection):
+        self._adapt_connection = adapt_connection
+        self._cursor = adapt_connection._call(adapt_connection._connection.cursor)
+        self.arraysize = 1
+        self._results = []
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+
+    def _call(self, fn, *args):
+        return self._adapt_connection._call(fn, *args, _cursor=self._cursor)
+
+    def execute(self, operation, parameters=None):
+        self._results = self._call(_execute_buffered, self._cursor,
+                                   operation, parameters, None)
+        self.nextset()
+
+    def executemany(self, operation, seq_of_parameters, **kw):
+        self._results = self._call(_execute_buffered, self._cursor,
+                                   operation, seq_of_parameters, kw)
+        self.nextset()
+
+    def nextset(self):
+        if not self._results:
+            return None
+        self.description, rows, self.rowcount = self._results.pop(0)
+        self._rows = list(rows)
+        return True
+
+    def setinputsizes(self, *inputsizes):
+        pass
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        while self._rows:
+            yield self._rows.pop(0)
+
+    def close(self):
+        self._rows = []
+        self._results = []
+        if self._cursor is not None:
+            self._call(self._cursor.close)
+            self._cursor = None
+
+
+class AsyncAdapt_teradata_ss_cursor(AsyncAdapt_teradata_cursor):
+    """
+    A server side cursor: rows are fetched from the driver as they
+    are requested.
+    """
+
+    server_side = True
+
+    def _execute(self, operation, parameters, many):
+        self._call(_execute, self._cursor, operation, parameters, many)
+        self.description = self._cursor.description
+        self.rowcount = self._cursor.rowcount
+
+    def execute(self, operation, parameters=None):
+        self._execute(operation, parameters, None)
+
+    def executemany(self, operation, seq_of_parameters, **kw):
+        self._execute(operation, seq_of_parameters, kw)
+
+    def nextset(self):
+        more = self._call(self._cursor.nextset)
+        self.description = self._cursor.description
+        self.rowcount = self._cursor.rowcount
+        return more
+
+    def fetchone(self):
+        return self._call(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        return self._call(self._cursor.fetchmany, size)
+
+    def fetchall(self):
+        return self._call(self._cursor.fetchall)
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(max(self.arraysize, 100))
+            if not rows:
+                return
+            for row in rows:
+                yield row
+
+
+class AsyncAdapt_teradata_connection(AdaptedConnection):
+    """
+    Runs the calls made on a driver connection on the thread pool.
+    """
+
+    await_ = staticmethod(await_only)
+
+    def __init__(self, dbapi, connection):
+        self.dbapi = dbapi
+        self._connection = connection
+
+    async def _run(self, fn, args, cursor):
+        # the executor of the dbapi is replaced when the engine is disposed
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.dbapi.executor, fn, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # the session stays busy until the driver call returns,
+            # so cancel the statement and wait for the thread
+            if cursor is not None:
+                cancel_statement(cursor, self._connection)
+            try:
+                await future
+            except Exception:
+                pass
+            raise
+
+    def _call(self, fn, *args, **kw):
+        return self.await_(self._run(fn, args, kw.get('_cursor')))
+
+    def cursor(self, server_side=False):
+        if server_side:
+            return AsyncAdapt_teradata_ss_cursor(self)
+        return AsyncAdapt_teradata_cursor(self)
+
+    def commit(self):
+        self._call(self._connection.commit)
+
+    def rollback(self):
+        self._call(self._connection.rollback)
+
+    def close(self):
+        self._call(self._connection.close)
+
+
+class AsyncAdapt_teradata_dbapi(object):
+    """
+    Wraps a blocking DBAPI module (tdodbc by default) so that
+    its connections run on a thread pool of thread_pool_size threads.
+    """
+
+    def __init__(self, dbapi, thread_pool_size):
+        self.dbapi = dbapi
+        self.thread_pool_size = thread_pool_size
+        self.executor = self._executor()
+        self.paramstyle = dbapi.paramstyle
+        for name in ('Warning', 'Error', 'InterfaceError', 'DatabaseError',
+                     'DataError', 'OperationalError', 'IntegrityError',
+                     'InternalError', 'ProgrammingError', 'NotSupportedError',
+                     'Binary'):
+            if hasattr(dbapi, name):
+                setattr(self, name, getattr(dbapi, name))
+
+    def _executor(self):
+        return ThreadPoolExecutor(self.thread_pool_size, thread_name_prefix='teradata')
+
+    def renew_executor(self):
+        """
+        Shuts the threads of the pool down, once their calls return, and
+        runs the next calls on a new pool.
+        """
+        executor, self.executor = self.executor, self._executor()
+        executor.shutdown(wait=False)
+
+    async def _connect(self, args, kwargs):
+        connect = lambda: self.dbapi.connect(*args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, connect)
+
+    def connect(self, *args, **kwargs):
+        connection = await_only(self._connect(args, kwargs))
+        return AsyncAdapt_teradata_connection(self, connection)
+
+
+class TeradataAsyncExecutionContext(TeradataExecutionContext):
+
+    def create_server_side_cursor(self):
+        return self._dbapi_connection.cursor(server_side=True)
+
+
+class TeradataAsyncDialect(TeradataDialect):
+
+    driver = 'async'
+    is_async = True
+    poolclass = pool.AsyncAdaptedQueuePool
+    supports_server_side_cursors = True
+    execution_ctx_cls = TeradataAsyncExecutionContext
+
+    def __init__(self, thread_pool_size=10, **kwargs):
+        super(TeradataAsyncDialect, self).__init__(**kwargs)
+        self.thread_pool_size = int(thread_pool_size)
+        if self.dbapi is not None and\
+                        not isinstance(self.dbapi, AsyncAdapt_teradata_dbapi):
+            self.dbapi = AsyncAdapt_teradata_dbapi(self.dbapi, self.thread_pool_size)
+
+    @classmethod
+    def engine_created(cls, engine):
+        if isinstance(engine.dialect.dbapi, AsyncAdapt_teradata_dbapi):
+            event.listen(engine, 'engine_disposed',
+                         lambda engine: engine.dialect.dbapi.renew_executor())
+
+    def get_driver_connection(self, connection):
+        return connection._connection
+
+
+dialect = TeradataAsyncDialect
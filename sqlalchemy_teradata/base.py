@@ -14,6 +14,8 @@ from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.schema import DDLElement
 from sqlalchemy.sql import table
 from sqlalchemy import types as sqltypes
+from sqlalchemy_teradata import explain, inlists, queryband
+from sqlalchemy_teradata.locking import lock_select
 from sqlalchemy.types import CHAR, DATE, DATETIME, \
                     BLOB, CLOB, TIMESTAMP, FLOAT, BIGINT, DECIMAL, NUMERIC, \
                     NCHAR, NVARCHAR, INTEGER, \
@@ -23,7 +25,12 @@ AUTOCOMMIT_REGEXP = re.compile(
             r'\s*(?:UPDATE|INSERT|CREATE|DELETE|DROP|ALTER|MERGE)',
                 re.I | re.UNICODE)
 
-#TODO: Read this from the dbc.restrictedwordsv view
+DDL_REGEXP = re.compile(
+            r'\s*(?:CREATE|DROP|ALTER|RENAME|REPLACE|MODIFY|COMMENT|GRANT|REVOKE)',
+                re.I | re.UNICODE)
+
+# the built-in reserved words, until those of the server are loaded
+# (see restrictedwords.py)
 ReservedWords = set(["abort", "abortsession", "abs", "access_lock", "account",
                     "acos", "acosh", "add", "add_months", "admin", "after",
                     "aggregate","all", "alter", "amp", "and", "ansidate",
@@ -37,6 +44,21 @@ ReservedWords = set(["abort", "abortsession", "abs", "access_lock", "account",
                      "title", "value",
                      'user','password', "preceded", "second", "succeeds", "year", "match", "time", "timestamp"])
 
+def cancel_statement(cursor, connection):
+    """
+    Cancels the statement running on a DBAPI cursor of connection, from
+    another thread.
+    """
+    for obj in (cursor, connection):
+        if hasattr(obj, 'cancel'):
+            obj.cancel()
+            return
+
+    # tdodbc has no cancel method but ODBC allows SQLCancel from any thread
+    if getattr(cursor, 'hStmt', None):
+        from teradata import tdodbc
+        tdodbc.odbc.SQLCancel(cursor.hStmt)
+
 class TeradataExecutionContext(default.DefaultExecutionContext):
 
     def __init__(self, dialect, connection, dbapi_connection, compiled_ddl):
@@ -45,6 +67,82 @@ class TeradataExecutionContext(default.DefaultExecutionContext):
     def should_autocommit_text(self, statement):
         return AUTOCOMMIT_REGEXP.match(statement)
 
+    _query_band_piggybacked = False
+
+    def create_cursor(self):
+        # the last step before SQLAlchemy expands the IN parameters
+        if self.dialect.in_list_threshold:
+            inlists.load_in_lists(self)
+        return super(TeradataExecutionContext, self).create_cursor()
+
+    def _expand_in_parameters(self, compiled, processors):
+        """
+        SQLAlchemy 1.3: selects the IN lists loaded into volatile tables
+        from them (see inlists.py) and expands the others.
+        """
+        params = self.compiled_parameters[0]
+        for name, value in list(params.items()):
+            if isinstance(value, inlists.InListTable):
+                self.statement = self.statement.replace('[EXPANDING_%s]' % name, value.select)
+                # an empty list adds no parameters, and its empty set
+                # expression has nowhere to go in the statement any more
+                params[name] = []
+        return super(TeradataExecutionContext, self)._expand_in_parameters(
+                                compiled, processors)
+
+    def _pre_request(self, cursor, statement, parameters):
+        """
+        Applies teradata_locking to statement, sets the query bands and runs
+        teradata_explain_guard on cursor before it is sent, and returns the
+        request to send. Called by the do_execute methods of the dialect,
+        for string statements too, where SQLAlchemy handles the DBAPI errors
+        of the statement.
+        """
+        statement = lock_select(statement, self.execution_options.get('teradata_locking'),
+                                self.dialect.identifier_preparer)
+        request = self._set_query_bands(cursor, statement)
+        guard = self.execution_options.get('teradata_explain_guard')
+        if guard and not self.isddl and\
+                        not isinstance(getattr(self.compiled, 'statement', None),
+                                       explain.Explain):
+            explain.guard_statement(cursor, statement, parameters, guard)
+        return request
+
+    def post_exec(self):
+        if self._query_band_piggybacked:
+            # skip the result of the SET QUERY_BAND statement
+            self.cursor.nextset()
+
+    def _set_query_bands(self, cursor, statement):
+        """
+        Sets the session query band if it changed on this pooled session and
+        piggybacks the per statement tags on the request (see queryband.py),
+        returning the request. DDL must be solitary, executemany repeats
+        the whole request per parameter set and SQLAlchemy 1.3 does not
+        call post_exec() for string statements, so the tags are sent on
+        their own for those.
+        """
+        # the dialect's first connect runs on the raw DBAPI connection,
+        # which has no info dictionary to track the session band in
+        info = getattr(self.root_connection.connection, 'info', None)
+        band = queryband.format_query_band(
+                    self.execution_options.get('teradata_query_band'))
+        if info is not None and band != info.get(queryband.SESSION_BAND_KEY):
+            cursor.execute(queryband.set_query_band_sql(band, 'SESSION'))
+            info[queryband.SESSION_BAND_KEY] = band
+
+        tags = queryband.format_query_band(
+                    self.execution_options.get('teradata_query_band_tags'))
+        if tags is None:
+            return statement
+        stmt = queryband.set_query_band_sql(tags, 'TRANSACTION')
+        if self.isddl or self.executemany or self.compiled is None or\
+                        DDL_REGEXP.match(statement):
+            cursor.execute(stmt)
+            return statement
+        self._query_band_piggybacked = True
+        return stmt + ';\n' + statement
+
 class TeradataIdentifierPreparer(compiler.IdentifierPreparer):
 
     reserved_words = ReservedWords
@@ -53,6 +151,24 @@ class TeradataIdentifierPreparer(compiler.IdentifierPreparer):
 
         super(TeradataIdentifierPreparer, self).__init__(dialect, initial_quote, final_quote,
                                                          escape_quote, omit_schema)
+        self._quoting = {}
+
+    def _requires_quotes(self, value):
+        # the same identifiers are checked over and over when compiling
+        try:
+            return self._quoting[value]
+        except KeyError:
+            res = self._quoting[value] = super(TeradataIdentifierPreparer,
+                                               self)._requires_quotes(value)
+            return res
+
+    def set_reserved_words(self, words):
+        """
+        Quotes the identifiers in words (lower case) from now on.
+        """
+        self.reserved_words = frozenset(words)
+        self._quoting.clear()
+        self._strings.clear()
 
 # Views Recipe from: https://bitbucket.org/zzzeek/sqlalchemy/wiki/UsageRecipes/Views
 class CreateView(DDLElement):
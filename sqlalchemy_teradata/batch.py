@@ -0,0 +1,339 @@
+# sqlalchemy_teradata/batch.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Multi-statement request batching.
+
+Teradata runs the statements of a multi-statement request in one round trip
+and parses them together. batch() collects statements and sends them as one
+such request, splitting the per-statement results back out:
+
+    from sqlalchemy_teradata.batch import batch
+
+    with batch(conn) as b:
+        users = b.execute(select([users_table]))
+        count = b.execute(select([func.count()]).select_from(orders))
+    users.fetchall(), count.scalar()
+
+A multi-statement request is a single transaction, and Teradata requires a
+DDL statement to be solitary in its request, so DDL cannot be batched.
+Neither can the expanding IN parameters, which SQLAlchemy fills in when it
+executes a statement; under SQLAlchemy 1.4 that is any col.in_(values).
+
+The teradata_locking, teradata_explain_guard and teradata_query_band(_tags)
+execution options apply as they do to Connection.execute(). The statements
+of a batch are one request and share its query bands.
+create_all() and drop_all() below batch the existence checks that
+MetaData.create_all(checkfirst=True) would otherwise send one table at a time.
+"""
+
+from sqlalchemy import exc, util
+from sqlalchemy.schema import DDLElement
+from sqlalchemy_teradata import explain, queryband
+from sqlalchemy_teradata.base import AUTOCOMMIT_REGEXP
+from sqlalchemy_teradata.locking import lock_select
+
+
+class BatchRow(tuple):
+    """
+    A row of a BatchResult, accessed by position, by column name or
+    label and by the column objects of the statement, like the rows of
+    a ResultProxy.
+    """
+
+    def __new__(cls, values, keys, keymap):
+        row = super(BatchRow, cls).__new__(cls, values)
+        row._keys = keys
+        row._keymap = keymap
+        return row
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, slice)):
+            try:
+                key = self._keymap[key]
+            except KeyError:
+                raise exc.NoSuchColumnError(
+                    'Could not locate column in row for column %r' % (key,))
+        return super(BatchRow, self).__getitem__(key)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except exc.NoSuchColumnError as e:
+            raise AttributeError(e.args[0])
+
+    def keys(self):
+        return list(self._keys)
+
+
+class BatchResult(object):
+    """
+    The result of one statement of a batch. It is populated when the batch
+    is sent, with the rows processed by the result types of the statement.
+    """
+
+    def __init__(self, statement, compiled=None):
+        self.statement = statement
+        self._compiled = compiled
+        self._rows = None
+
+    def _load(self, cursor, dialect):
+        self.rowcount = cursor.rowcount
+        if not cursor.description:
+            self.keys = []
+            self._rows = []
+            return
+
+        self.keys = [d[0] for d in cursor.description]
+        keymap = dict((k, i) for i, k in reversed(list(enumerate(self.keys))))
+        processors = [None] * len(self.keys)
+        columns = self._compiled._result_columns if self._compiled is not None else []
+        # the columns of a compiled statement are those of its description,
+        # as SQLAlchemy matches them; textual statements have none
+        if len(columns) == len(self.keys):
+            self.keys = []
+            for i, (keyname, _, objects, type_) in enumerate(columns):
+                self.keys.append(keyname)
+                keymap[keyname] = i
+                for obj in objects:
+                    keymap.setdefault(obj, i)
+                processors[i] = type_.dialect_impl(dialect).result_processor(
+                                        dialect, cursor.description[i][1])
+
+        self._rows = [BatchRow([p(v) if p is not None else v
+                                for p, v in zip(processors, row)], self.keys, keymap)
+                      for row in cursor.fetchall()]
+
+    def _check(self):
+        if self._rows is None:
+            raise exc.InvalidRequestError(
+                'The batch containing this statement has not been sent yet')
+
+    def fetchall(self):
+        self._check()
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        self._check()
+        return self._rows.pop(0) if self._rows else None
+
+    def scalar(self):
+        row = self.fetchone()
+        return row[0] if row is not None else None
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class Batch(object):
+    """
+    Collects statements executed through it and sends them to the
+    connection as a single multi-statement request on flush().
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._pending = []
+
+    def execute(self, statement, *multiparams, **params):
+        """
+        Adds statement to the batch and returns its BatchResult.
+        Parameters are given as for Connection.execute(); plain string
+        statements take positional qmark parameters.
+        """
+        if isinstance(statement, DDLElement):
+            raise exc.ArgumentError(
+                'DDL must be the only statement of a Teradata request '
+                'and cannot be batched')
+
+        options = self.connection._execution_options
+        if isinstance(statement, util.string_types):
+            compiled = None
+            if len(multiparams) == 1 and isinstance(multiparams[0], (list, tuple)):
+                sql, args = statement, list(multiparams[0])
+            else:
+                sql, args = statement, list(multiparams)
+        else:
+            options = options.union(statement._execution_options)
+            compiled, sql, args = self._compile(statement, multiparams, params)
+
+        sql = lock_select(sql, options.get('teradata_locking'),
+                          self.connection.dialect.identifier_preparer)
+        result = BatchResult(sql, compiled)
+        self._pending.append((sql, args, result, options))
+        return result
+
+    def _compile(self, statement, multiparams, params):
+        if multiparams:
+            params = dict(multiparams[0], **params)
+
+        dialect = self.connection.dialect
+        # the columns given values, as Connection.execute() compiles them
+        compiled = statement.compile(dialect=dialect, column_keys=list(params))
+        for bind in compiled.binds.values():
+            if getattr(bind, 'expanding', False) or getattr(bind, 'literal_execute', False):
+                raise exc.ArgumentError(
+                    'The expanding parameter %r is filled in when the statement '
+                    'is executed and cannot be batched; execute the statement '
+                    'outside of the batch' % bind.key)
+
+        values = compiled.construct_params(params)
+        if compiled.insert_prefetch or compiled.update_prefetch:
+            self._apply_defaults(compiled, values)
+        args = []
+        for key in compiled.positiontup:
+            process = compiled.binds[key].type.dialect_impl(dialect).bind_processor(dialect)
+            args.append(process(values[key]) if process is not None else values[key])
+        return compiled, util.text_type(compiled), args
+
+    def _apply_defaults(self, compiled, values):
+        """
+        Fills in the Python side column defaults of an INSERT or UPDATE
+        into values, as the execution context of the statement would.
+        """
+        for column in compiled.insert_prefetch + compiled.update_prefetch:
+            default = column.default if column in compiled.insert_prefetch else column.onupdate
+            if default is not None and (default.is_sequence or default.is_clause_element):
+                raise exc.ArgumentError(
+                    'The default of column %r is executed by the database before '
+                    'the statement and cannot be batched; execute the statement '
+                    'outside of the batch' % column.key)
+
+        # an execution context of the dialect runs the defaults, so that the
+        # default functions get the context they expect; the statement is
+        # not executed through it
+        context = self.connection.dialect.execution_ctx_cls.__new__(
+                                self.connection.dialect.execution_ctx_cls)
+        context.dialect = self.connection.dialect
+        context.root_connection = self.connection
+        context.execution_options = self.connection._execution_options
+        context.compiled = compiled
+        context.compiled_parameters = [values]
+        context.isinsert = compiled.isinsert
+        context.isupdate = compiled.isupdate
+        context._process_executesingle_defaults()
+
+    def _query_bands(self, pending):
+        bands = set((queryband.format_query_band(p[3].get('teradata_query_band')),
+                     queryband.format_query_band(p[3].get('teradata_query_band_tags')))
+                    for p in pending)
+        if len(bands) > 1:
+            raise exc.ArgumentError(
+                'The statements of a batch are one request and must have the '
+                'same teradata_query_band and teradata_query_band_tags')
+        return bands.pop()
+
+    def flush(self):
+        """
+        Sends the pending statements as one request and loads their results.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        band, tags = self._query_bands(pending)
+        sql = ';\n'.join(p[0] for p in pending)
+        args = [a for p in pending for a in p[1]]
+        if tags is not None:
+            sql = queryband.set_query_band_sql(tags, 'TRANSACTION') + ';\n' + sql
+
+        connection = self.connection
+        dialect = connection.dialect
+        dbapi_conn = connection.connection
+        cursor = dbapi_conn.cursor()
+        # the DBAPI errors are handled by the connection as those of
+        # Connection.execute(), which also closes the cursor
+        try:
+            for stmt, stmt_args, result, options in pending:
+                guard = options.get('teradata_explain_guard')
+                if guard and not isinstance(getattr(result._compiled, 'statement', None),
+                                            explain.Explain):
+                    explain.guard_statement(cursor, stmt, stmt_args, guard)
+
+            if band != dbapi_conn.info.get(queryband.SESSION_BAND_KEY):
+                cursor.execute(queryband.set_query_band_sql(band, 'SESSION'))
+                dbapi_conn.info[queryband.SESSION_BAND_KEY] = band
+        except BaseException as e:
+            connection._handle_dbapi_exception(e, sql, args, cursor, None)
+
+        # with the events, logging and disconnect handling of the statements
+        # of the connection
+        connection._cursor_execute(cursor, sql, args)
+        try:
+            if tags is not None:
+                cursor.nextset()
+            for i, p in enumerate(pending):
+                if i:
+                    cursor.nextset()
+                p[2]._load(cursor, dialect)
+        except BaseException as e:
+            connection._handle_dbapi_exception(e, sql, args, cursor, None)
+        cursor.close()
+
+        if not self.connection.in_transaction() and\
+                        any(AUTOCOMMIT_REGEXP.match(p[0]) for p in pending):
+            self.connection.dialect.do_commit(dbapi_conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        if type_ is None:
+            self.flush()
+        else:
+            self._pending = []
+
+
+def batch(connection):
+    """
+    Returns a Batch for connection, for use as a context manager.
+    """
+    return Batch(connection)
+
+
+def _existing_tables(connection, tables):
+    """
+    Returns the subset of tables that exist, probing all of them
+    in a single multi-statement request.
+    """
+    dialect = connection.dialect
+    with batch(connection) as b:
+        probes = [(t, b.execute(dialect._has_table_query(),
+                                schema=t.schema or dialect.default_schema_name,
+                                table_name=t.name)) for t in tables]
+    return set(t for t, res in probes if res.fetchone() is not None)
+
+
+def _tables(metadata, tables):
+    return list(metadata.tables.values()) if tables is None else list(tables)
+
+
+def create_all(bind, metadata, tables=None, checkfirst=True):
+    """
+    Like metadata.create_all(bind), but checks for the existing tables
+    with one request instead of one request per table.
+    """
+    with bind.connect() as conn:
+        tables = _tables(metadata, tables)
+        if checkfirst and tables:
+            existing = _existing_tables(conn, tables)
+            tables = [t for t in tables if t not in existing]
+        metadata.create_all(conn, tables=tables, checkfirst=False)
+
+
+def drop_all(bind, metadata, tables=None, checkfirst=True):
+    """
+    Like metadata.drop_all(bind), but checks for the existing tables
+    with one request instead of one request per table.
+    """
+    with bind.connect() as conn:
+        tables = _tables(metadata, tables)
+        if checkfirst and tables:
+            existing = _existing_tables(conn, tables)
+            tables = [t for t in tables if t in existing]
+        metadata.drop_all(conn, tables=tables, checkfirst=False)
@@ -13,12 +13,13 @@ from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql.expression import Select
 from sqlalchemy import exc, sql
 from sqlalchemy import create_engine
+from sqlalchemy_teradata import inlists
 
 
 class TeradataCompiler(compiler.SQLCompiler):
 
-    def __init__(self, dialect, statement, column_keys=None, inline=False, **kwargs):
-        super(TeradataCompiler, self).__init__(dialect, statement, column_keys, inline, **kwargs)
+    def __init__(self, dialect, statement, *args, **kwargs):
+        super(TeradataCompiler, self).__init__(dialect, statement, *args, **kwargs)
 
     def get_select_precolumns(self, select, **kwargs):
         """
@@ -34,10 +35,51 @@ class TeradataCompiler(compiler.SQLCompiler):
 
         #TODO: decide whether we can replace this with the recipe...
         if (select._limit is not None and select._offset is None):
-            pre += "TOP %d " % (select._limit)
+            if self.dialect.parameterize_literals:
+                pre += "TOP %s " % self.process(select._limit_clause, **kwargs)
+            else:
+                pre += "TOP %d " % (select._limit)
 
         return pre
 
+    def visit_bindparam(self, bindparam, literal_binds=False, **kwargs):
+        # with parameterize_literals, the values of a literal_binds compilation
+        # are bound too, so that the text of the statement is the same
+        # whatever the values; the SQL compiler of DDL has no statement and
+        # keeps its literals
+        if literal_binds and self.dialect.parameterize_literals and\
+                        self.statement is not None:
+            literal_binds = False
+        return super(TeradataCompiler, self).visit_bindparam(
+                        bindparam, literal_binds=literal_binds, **kwargs)
+
+    def visit_binary(self, binary, **kwargs):
+        # long IN lists of a parameter per value are bound as one expanding
+        # parameter, which can be loaded into a volatile table (see inlists.py)
+        if self.dialect.in_list_threshold and binary.operator in inlists.IN_OPERATORS and\
+                        not kwargs.get('literal_binds'):
+            expanding = inlists.expanding_in(binary, self.dialect.in_list_threshold)
+            if expanding is not None:
+                binary = expanding
+        return super(TeradataCompiler, self).visit_binary(binary, **kwargs)
+
+    def visit_empty_set_expr(self, element_types):
+        # the IN of an empty list of SQLAlchemy 1.3: a query of no rows
+        return 'SELECT %s FROM (SELECT 1 AS c) AS td_empty_set WHERE 1 = 0' % ', '.join(
+                        self._null_of_type(type_) for type_ in element_types)
+
+    def _null_of_type(self, type_):
+        ddl = self.dialect._type_ddl(type_)
+        return 'CAST(NULL AS %s)' % ddl if ddl is not None else 'NULL'
+
+    def _literal_execute_expanding_parameter(self, name, parameter, values):
+        # SQLAlchemy 1.4 expands the IN parameters here; SQLAlchemy 1.3 in
+        # TeradataExecutionContext._expand_in_parameters
+        if isinstance(values, inlists.InListTable):
+            return [], values.select
+        return super(TeradataCompiler, self)._literal_execute_expanding_parameter(
+                        name, parameter, values)
+
     def limit_clause(self, select, **kwargs):
         """Limit after SELECT is implemented in get_select_precolumns"""
         return ""
@@ -461,8 +503,47 @@ class TDCreateTablePost(TeradataOptions):
         return self.__class__(self._append(self.opts, {res: c}))
 
 
+# the visitors that do not render from the parameters of the type alone
+_UNCACHED_VISITS = frozenset(['type_decorator', 'user_defined', 'PERIOD'])
+
+
 class TeradataTypeCompiler(compiler.GenericTypeCompiler):
 
+   # the DDL of the types rendered so far, by class and parameters; cleared
+   # when it reaches _cache_size
+   _cache = {}
+   _cache_size = 1000
+
+   def process(self, type_, **kw):
+       """
+       Renders the DDL of type_ once for every class and parameters
+       (length, charset, collation, precision, scale, timezone, multiplier
+       and frac_precision). Type decorators, user defined types and
+       PERIODs (whose item type is cached) are rendered each time, as are
+       calls with keywords other than type_expression.
+       """
+       if type_.__visit_name__ in _UNCACHED_VISITS or \
+               (kw and (len(kw) > 1 or 'type_expression' not in kw)):
+           return type_._compiler_dispatch(self, **kw)
+
+       params = type_.__dict__.get
+       key = (type_.__class__, params('length'), params('charset'), params('collation'),
+              params('precision'), params('scale'), params('timezone'),
+              params('multiplier'), params('frac_precision'))
+       try:
+           return self._cache[key]
+       except KeyError:
+           pass
+       except TypeError:
+           # an unhashable parameter
+           return type_._compiler_dispatch(self, **kw)
+
+       ddl = type_._compiler_dispatch(self, **kw)
+       if len(self._cache) >= self._cache_size:
+           self._cache.clear()
+       self._cache[key] = ddl
+       return ddl
+
    def _get(self, key, type_, kw):
        return kw.get(key, getattr(type_, key, None))
 
@@ -599,8 +680,24 @@ class TeradataTypeCompiler(compiler.GenericTypeCompiler):
 
        return self._string_process(type_, 'CLOB', **kw)
 
-   def visit_BLOB(self, type, **kw):
-       pass
+   def visit_BLOB(self, type_, **kw):
+       length = self._get('length', type_, kw)
+       if length is None:
+           return 'BLOB'
+       multi = self._get('multiplier', type_, kw) or ''
+       return 'BLOB({}{})'.format(length, multi)
+
+   def visit_BINARY(self, type_, **kw):
+       length = self._get('length', type_, kw)
+       return 'BYTE({})'.format(length) if length is not None else 'BYTE'
+
+   def visit_VARBINARY(self, type_, **kw):
+       # VARBYTE needs a length, 64000 is the largest
+       length = self._get('length', type_, kw)
+       return 'VARBYTE({})'.format(length if length is not None else 64000)
+
+   def visit_PERIOD(self, type_, **kw):
+       return 'PERIOD({})'.format(self.process(type_.item_type))
 
    def visit_BOOLEAN(self, type_, **kw):
        return self.visit_BYTEINT(type_, **kw)
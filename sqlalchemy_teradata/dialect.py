@@ -5,16 +5,20 @@
 # This module is part of sqlalchemy-teradata and is released under
 # the MIT License: http://www.opensource.org/licenses/mit-license.php
 
-from sqlalchemy.engine import default
-from sqlalchemy import pool, String, Numeric
+from sqlalchemy.engine import default, reflection
+from sqlalchemy import exc, pool, String, Numeric
 from sqlalchemy.sql import select, and_, or_
 from sqlalchemy_teradata.compiler import TeradataCompiler, TeradataDDLCompiler, TeradataTypeCompiler
-from sqlalchemy_teradata.base import TeradataIdentifierPreparer, TeradataExecutionContext
+from sqlalchemy_teradata.base import (TeradataIdentifierPreparer, TeradataExecutionContext,
+                                      ReservedWords)
 from sqlalchemy.sql.expression import text, table, column, asc
 from sqlalchemy import Table, Column, Index
 import sqlalchemy.types as sqltypes
 import sqlalchemy_teradata.types as tdtypes
+from sqlalchemy_teradata import inlists, restrictedwords, sqlshapes
 from itertools import groupby
+from functools import partial, update_wrapper
+import weakref
 
 # ischema names is used for reflecting columns (see get_columns in the dialect)
 ischema_names = {
@@ -37,15 +41,194 @@ ischema_names = {
     'sz': tdtypes.TIMESTAMP,    #Added timestamp with timezone
     'at': tdtypes.TIME,
     'tz': tdtypes.TIMESTAMP,    #Added time with timezone
-    
-    #Expreimental - Binary
+
     'bf': sqltypes.BINARY,
     'bv': sqltypes.VARBINARY,
-    'bo': sqltypes.BLOB
-} #TODO: add the interval types and blob
+    'bo': tdtypes.BLOB,
+
+    'yr': tdtypes.IntervalYear,
+    'ym': tdtypes.IntervalYearToMonth,
+    'mo': tdtypes.IntervalMonth,
+    'dy': tdtypes.IntervalDay,
+    'dh': tdtypes.IntervalDayToHour,
+    'dm': tdtypes.IntervalDayToMinute,
+    'ds': tdtypes.IntervalDayToSecond,
+    'hr': tdtypes.IntervalHour,
+    'hm': tdtypes.IntervalHourToMinute,
+    'hs': tdtypes.IntervalHourToSecond,
+    'mi': tdtypes.IntervalMinute,
+    'ms': tdtypes.IntervalMinuteToSecond,
+    'sc': tdtypes.IntervalSecond,
+
+    'pd': tdtypes.PERIOD,
+    'pt': tdtypes.PERIOD,
+    'pz': tdtypes.PERIOD,
+    'ps': tdtypes.PERIOD,
+    'pm': tdtypes.PERIOD,
+}
+
+# the types of the beginning and end of the PERIOD codes, and whether
+# they have a time zone
+_period_items = {
+    'pd': (sqltypes.DATE, None),
+    'pt': (tdtypes.TIME, False),
+    'pz': (tdtypes.TIME, True),
+    'ps': (tdtypes.TIMESTAMP, False),
+    'pm': (tdtypes.TIMESTAMP, True),
+}
+
+# the character sets of dbc.ColumnsV.CharType
+charsets = {
+    1: 'LATIN',
+    2: 'UNICODE',
+    3: 'KANJISJIS',
+    4: 'GRAPHIC'}
+
+# the character sets whose ColumnLength is in bytes of 2 per character
+_double_byte = ('UNICODE', 'GRAPHIC')
+
+
+def _string_type(t, length, chartype, prec, scale, fmt):
+    charset = charsets.get(chartype)
+    if charset in _double_byte:
+        length //= 2
+    return t(length=length, charset=charset)
+
+
+def _national_string_type(t, length, chartype, prec, scale, fmt):
+    return t(length=length // 2)
+
+
+def _numeric_type(t, length, chartype, prec, scale, fmt):
+    return t(precision=prec, scale=scale)
+
+
+def _datetime_type(t, length, chartype, prec, scale, fmt):
+    fmt = fmt or ''
+    tz = fmt[-1:] == 'Z'
+
+    # for some timestamps and dates, there is no precision, or it is in scale
+    prec = fmt[fmt.index('(') + 1: fmt.index(')')] if '(' in fmt else 0
+    prec = scale if prec == 'F' else int(prec)
+    return t(precision=prec, timezone=tz)
+
+
+def _interval_type(t, length, chartype, prec, scale, fmt):
+    if issubclass(t, (tdtypes.IntervalDayToSecond, tdtypes.IntervalHourToSecond,
+                      tdtypes.IntervalMinuteToSecond, tdtypes.IntervalSecond)):
+        return t(precision=prec or None, frac_precision=scale)
+    return t(precision=prec or None)
+
+
+def _period_type(code, length, chartype, prec, scale, fmt):
+    # the precision of the item is in DecimalFractionalDigits
+    t, tz = _period_items[code]
+    if tz is None:
+        return tdtypes.PERIOD(t())
+    return tdtypes.PERIOD(t(precision=scale, timezone=tz))
+
+
+def _binary_type(t, length, chartype, prec, scale, fmt):
+    return t(length=length)
+
+
+def _plain_type(t, length, chartype, prec, scale, fmt):
+    # for types like Integer, ByteInt
+    return t()
+
+
+def _type_constructor(t):
+    """
+    The function constructing the type t of a column from the
+    dictionary columns (length, chartype, prec, scale, fmt).
+    """
+    if issubclass(t, (sqltypes.NCHAR, sqltypes.NVARCHAR)):
+        constructor = _national_string_type
+    elif issubclass(t, sqltypes.String):
+        constructor = _string_type
+    elif issubclass(t, sqltypes.Numeric):
+        constructor = _numeric_type
+    elif issubclass(t, (sqltypes.Time, sqltypes.DateTime)):
+        constructor = _datetime_type
+    elif issubclass(t, tdtypes._TDInterval):
+        constructor = _interval_type
+    elif issubclass(t, sqltypes._Binary):
+        constructor = _binary_type
+    else:
+        constructor = _plain_type
+    return partial(constructor, t)
+
+
+# the type constructors of the ColumnType codes of ischema_names
+type_constructors = dict((code, _type_constructor(t)) for code, t in ischema_names.items())
+type_constructors.update((code, partial(_period_type, code)) for code in _period_items)
+
+
+# the dictionary values of a column, see TeradataDialect._get_column_info
+COLUMN_KEYS = ('columnname', 'columntype', 'columnlength', 'chartype',
+               'decimaltotaldigits', 'decimalfractionaldigits', 'columnformat',
+               'nullable', 'defaultvalue', 'idcoltype')
+
+# the info_cache key of the tables reflected by sqlalchemy_teradata.parallel
+REFLECTED_KEY = 'teradata_reflected'
+
+
+def _snapshot_cache(fn):
+    """
+    Answers a reflection method from the tables gathered in the info_cache
+    of the Inspector by parallel.reflect(), or from the ReflectionSnapshot
+    installed on the dialect (see sqlalchemy_teradata.snapshot), when they
+    hold the table.
+    """
+    def decorated(self, connection, table_name, schema=None, **kw):
+        info_cache = kw.get('info_cache')
+        sources = (info_cache.get(REFLECTED_KEY) if info_cache is not None else None,
+                   self.reflection_snapshot)
+        for source in sources:
+            if source is not None:
+                res = source.get(fn.__name__, table_name,
+                                 schema or self.default_schema_name)
+                if res is not None:
+                    return res
+        return fn(self, connection, table_name, schema=schema, **kw)
+    return update_wrapper(decorated, fn)
+
+
+class TeradataInspector(reflection.Inspector):
+    """
+    Adds the multi-table reflection methods, which reflect the tables of a
+    schema from a single scan of dbc.Indices and return a dict keyed by
+    (schema, table_name):
+
+        insp = inspect(engine)
+        indexes = insp.get_multi_indexes(schema='sales')
+        pk = insp.get_multi_pk_constraint(filter_names=['t1', 't2'])
+
+    The rows are kept in the Inspector's cache, so get_pk_constraint,
+    get_unique_constraints and get_indexes of the same Inspector answer
+    from them afterwards.
+    """
+
+    def _get_multi(self, method, schema, filter_names, **kw):
+        # Inspector operates on a connection from 1.4 on
+        context = getattr(self, '_operation_context', None)
+        if context is None:
+            return getattr(self.dialect, method)(self.bind, schema, filter_names,
+                                                 info_cache=self.info_cache, **kw)
+        with context() as conn:
+            return getattr(self.dialect, method)(conn, schema, filter_names,
+                                                 info_cache=self.info_cache, **kw)
+
+    def get_multi_pk_constraint(self, schema=None, filter_names=None, **kw):
+        return self._get_multi('get_multi_pk_constraint', schema, filter_names, **kw)
+
+    def get_multi_unique_constraints(self, schema=None, filter_names=None, **kw):
+        return self._get_multi('get_multi_unique_constraints', schema, filter_names, **kw)
+
+    def get_multi_indexes(self, schema=None, filter_names=None, **kw):
+        return self._get_multi('get_multi_indexes', schema, filter_names, **kw)
+
 
-stringtypes=[ t for t in ischema_names if issubclass(ischema_names[t],sqltypes.String)]
-        
 class TeradataDialect(default.DefaultDialect):
 
     name = 'teradata'
@@ -58,6 +241,7 @@ class TeradataDialect(default.DefaultDialect):
     type_compiler = TeradataTypeCompiler
     preparer = TeradataIdentifierPreparer
     execution_ctx_cls = TeradataExecutionContext
+    inspector = TeradataInspector
 
     supports_native_boolean = False
     supports_native_decimal = True
@@ -84,8 +268,77 @@ class TeradataDialect(default.DefaultDialect):
       })
     ]
 
-    def __init__(self, **kwargs):
+    colspecs = {
+        sqltypes.Numeric: tdtypes._TDNumeric,
+        sqltypes.Float: sqltypes.Float,
+        sqltypes.Date: tdtypes._TDDate,
+        sqltypes.DateTime: tdtypes._TDDateTime,
+        sqltypes.Time: tdtypes._TDTime,
+    }
+
+    # set by ReflectionSnapshot.load()
+    reflection_snapshot = None
+
+    # the reflected types by dictionary values (see _resolve_type); cleared
+    # when it reaches _type_cache_size
+    _type_cache_size = 1000
+
+    def __init__(self, batch_executemany=False, dictionary_locking=True,
+                 load_restricted_words=True, restricted_words_cache=None, native_types=True,
+                 parameterize_literals=False, track_sql_shapes=False, in_list_threshold=None,
+                 in_list_types=(), **kwargs):
         super(TeradataDialect, self).__init__(**kwargs)
+        # send executemany as the parameter arrays of a single request,
+        # tdodbc's batch=True (see do_executemany)
+        self.batch_executemany = batch_executemany
+        self.dictionary_locking = dictionary_locking
+        self.load_restricted_words = load_restricted_words
+        self.restricted_words_cache = restricted_words_cache
+        # False when the driver returns DECIMAL, DATE, TIMESTAMP and TIME
+        # values as strings, e.g. tdodbc with a dataTypeConverter that
+        # leaves them alone, and the dialect parses them
+        self.native_types = native_types
+        self._type_cache = {}
+        # bind the literals of TOP n and of literal_binds compilations, and
+        # record the shapes of the requests sent (see sqlshapes.py)
+        self.parameterize_literals = parameterize_literals
+        self.sql_shapes = sqlshapes.SQLShapes() if track_sql_shapes else None
+        # the IN lists longer than in_list_threshold are loaded into the
+        # volatile tables of each DBAPI connection, those of in_list_types
+        # created when it connects (see inlists.py)
+        self.in_list_threshold = in_list_threshold
+        self.in_list_types = in_list_types
+        self._in_list_volatile_tables = weakref.WeakKeyDictionary()
+
+    def on_connect(self):
+        if not self.in_list_types:
+            return None
+
+        def create_in_list_tables(dbapi_connection):
+            # a new connection is not in a transaction yet
+            inlists.create_tables(self, dbapi_connection, self.in_list_types)
+        return create_in_list_tables
+
+    def initialize(self, connection):
+        super(TeradataDialect, self).initialize(connection)
+        if self.load_restricted_words:
+            words = restrictedwords.load_restricted_words(
+                        connection, self.server_version_info, self.restricted_words_cache)
+            if words is not None:
+                # the built-in words include keywords, such as value, title
+                # and password, which are rejected as bare identifiers
+                # without being reserved words of the server
+                self.identifier_preparer.set_reserved_words(ReservedWords | words)
+
+    def _dictionary_query(self, stmt):
+        """
+        Reads of the data dictionary are done with LOCKING ROW FOR ACCESS,
+        unless dictionary_locking is False, so that reflection does not
+        queue behind the dictionary locks of concurrent DDL.
+        """
+        if self.dictionary_locking:
+            return stmt.execution_options(teradata_locking='access')
+        return stmt
 
     def create_connect_args(self, url):
       if url is not None:
@@ -102,6 +355,60 @@ class TeradataDialect(default.DefaultDialect):
         from teradata import tdodbc
         return tdodbc
 
+    def _in_list_tables(self, dbapi_connection):
+        """
+        The volatile tables of the IN lists created on dbapi_connection, by
+        their column type and number.
+        """
+        if isinstance(dbapi_connection, pool._ConnectionFairy):
+            dbapi_connection = dbapi_connection.connection
+        return self._in_list_volatile_tables.setdefault(dbapi_connection, {})
+
+    def _type_ddl(self, type_):
+        """
+        The Teradata type of type_ as in DDL, e.g. 'VARCHAR(20) CHAR SET
+        UNICODE', 'DECIMAL(12, 2)' or 'TIMESTAMP(3)', None for no known type.
+        """
+        if type_._isnull:
+            return None
+        try:
+            return self.type_compiler.process(type_)
+        except exc.CompileError:
+            return None
+
+    def do_close(self, dbapi_connection):
+        # the pool closes invalidated and recycled connections here too
+        self._in_list_volatile_tables.pop(dbapi_connection, None)
+        dbapi_connection.close()
+
+    def do_executemany(self, cursor, statement, parameters, context=None, batch=None):
+        if self.sql_shapes is not None:
+            self.sql_shapes.record(statement)
+        if context is not None:
+            statement = context._pre_request(cursor, statement, parameters[0])
+        if batch is None:
+            batch = self.batch_executemany
+        if batch:
+            # all the rows are bound as parameter arrays of a single request
+            # instead of executing the statement once per row
+            cursor.executemany(statement, parameters, batch=True)
+        else:
+            cursor.executemany(statement, parameters)
+
+    def do_execute(self, cursor, statement, parameters, context=None):
+        if self.sql_shapes is not None:
+            self.sql_shapes.record(statement)
+        if context is not None:
+            statement = context._pre_request(cursor, statement, parameters)
+        cursor.execute(statement, parameters)
+
+    def do_execute_no_params(self, cursor, statement, context=None):
+        if self.sql_shapes is not None:
+            self.sql_shapes.record(statement)
+        if context is not None:
+            statement = context._pre_request(cursor, statement, None)
+        cursor.execute(statement)
+
     def normalize_name(self, name, **kw):
         if name is not None:
             return name.strip().lower()
@@ -112,69 +419,49 @@ class TeradataDialect(default.DefaultDialect):
         if schema is None:
             schema=self.default_schema_name
 
-        stmt = select([column('tablename')],
-                      from_obj=[text('dbc.tablesvx')]).where(
-                        and_(text('DatabaseName=:schema'),
-                             text('TableName=:table_name')))
-
+        stmt = self._has_table_query()
         res = connection.execute(stmt, schema=schema, table_name=table_name).fetchone()
         return res is not None
 
-    def _resolve_type(self, t, **kw):
+    def _has_table_query(self):
         """
-        Resolve types for String, Numeric, Date/Time, etc. columns
+        The dictionary query used by has_table, taking the schema
+        and table_name parameters.
         """
-        t = self.normalize_name(t)
-        if t in ischema_names:
-            #print(t,ischema_names[t])
-            t = ischema_names[t]
-            
-            if issubclass(t, sqltypes.String):
-                return t(length=kw['length']/2 if kw['chartype']=='UNICODE' else kw['length'],\
-                            charset=kw['chartype'])
-
-            elif issubclass(t, sqltypes.Numeric):
-                return t(precision=kw['prec'], scale=kw['scale'])
-
-            elif issubclass(t, sqltypes.Time) or issubclass(t, sqltypes.DateTime):
-                #Timezone
-                tz=kw['fmt'][-1]=='Z'
-
-                #Precision                
-                prec = kw['fmt']    
-                #For some timestamps and dates, there is no precision, or indicatd in scale
-                prec = prec[prec.index('(') + 1: prec.index(')')] if '(' in prec else 0
-                prec = kw['scale'] if prec=='F' else int(prec)
-
-                #prec = int(prec[prec.index('(') + 1: prec.index(')')]) if '(' in prec else 0
-                return t(precision=prec,timezone=tz)
-
-            elif issubclass(t, sqltypes.Interval):
-                return t(day_precision=kw['prec'],second_precision=kw['scale'])
+        return self._dictionary_query(
+                    select([column('tablename')],
+                           from_obj=[text('dbc.tablesvx')]).where(
+                             and_(text('DatabaseName=:schema'),
+                                  text('TableName=:table_name'))))
 
+    def _resolve_type(self, code, length=None, chartype=None, prec=None, scale=None, fmt=None):
+        """
+        The type of a column from its dictionary values (ColumnType,
+        ColumnLength, CharType, DecimalTotalDigits, DecimalFractionalDigits,
+        ColumnFormat). Columns of the same values share their type, which
+        is not to be altered.
+        """
+        key = (code, length, chartype, prec, scale, fmt)
+        typ = self._type_cache.get(key)
+        if typ is None:
+            constructor = type_constructors.get(code.strip().lower() if code else None)
+            if constructor is None:
+                typ = ischema_names[None]()
             else:
-                return t() # For types like Integer, ByteInt
-
-        return ischema_names[None]
+                typ = constructor(int(length or 0), chartype, int(prec or 0),
+                                  int(scale or 0), fmt)
+            if len(self._type_cache) >= self._type_cache_size:
+                self._type_cache.clear()
+            self._type_cache[key] = typ
+        return typ
 
     def _get_column_info(self, row):
         """
         Resolves the column information for get_columns given a row.
         """
-        chartype = {
-                  0: None,
-                  1: 'LATIN',
-                  2: 'UNICODE',
-                  3: 'KANJISJIS',
-                  4: 'GRAPHIC'}
-        
-        #Handle unspecified characterset and disregard chartypes specified for non-character types (e.g. binary, json)
-        typ = self._resolve_type(row['columntype'],\
-                                    length=int(row['columnlength'] or 0),\
-                                    chartype=chartype[row['chartype'] if row['chartype'] in stringtypes else 0],\
-                                    prec=int(row['decimaltotaldigits'] or 0),\
-                                    scale=int(row['decimalfractionaldigits'] or 0),\
-                                    fmt=row['columnformat'])
+        typ = self._resolve_type(row['columntype'], row['columnlength'], row['chartype'],
+                                 row['decimaltotaldigits'], row['decimalfractionaldigits'],
+                                 row['columnformat'])
 
         autoinc = row['idcoltype'] in ('GA', 'GD')
 
@@ -189,8 +476,16 @@ class TeradataDialect(default.DefaultDialect):
                }
 
 
+    @_snapshot_cache
     def get_columns(self, connection, table_name, schema=None, **kw):
+        return [self._get_column_info(row)
+                for row in self._get_column_rows(connection, table_name, schema)]
 
+    def _get_column_rows(self, connection, table_name, schema=None):
+        """
+        The dictionary rows of the columns of a table, as dicts of the
+        values _get_column_info() takes.
+        """
         helpView=False
         
         if schema is None:
@@ -205,28 +500,27 @@ class TeradataDialect(default.DefaultDialect):
                             and_(text('DatabaseName=:schema'),\
                                  text('TableName=:table_name'),\
                                  text("tablekind='V'")))
-            res = connection.execute(stmt, schema=schema, table_name=table_name).rowcount
+            res = connection.execute(self._dictionary_query(stmt),
+                                 schema=schema, table_name=table_name).rowcount
             helpView = (res==1)
 
         else:
             dbc_columninfo='dbc.ColumnsQV'
         
-        stmt = select([column('columnname'), column('columntype'),\
-                        column('columnlength'), column('chartype'),\
-                        column('decimaltotaldigits'), column('decimalfractionaldigits'),\
-                        column('columnformat'),\
-                        column('nullable'), column('defaultvalue'), column('idcoltype')],\
+        stmt = select([column(key) for key in COLUMN_KEYS],\
                         from_obj=[text(dbc_columninfo)]).where(\
                         and_(text('DatabaseName=:schema'),\
                              text('TableName=:table_name')))
 
-        res = connection.execute(stmt, schema=schema, table_name=table_name).fetchall()
+        res = connection.execute(self._dictionary_query(stmt),
+                                 schema=schema, table_name=table_name).fetchall()
         
         #If this is a view in pre-16 version, get types for individual columns
         if helpView:
-            res=[self._get_column_help(connection, schema,table_name,r['columnname']) for r in res]
-            
-        return [self._get_column_info(row) for row in res]
+            return [self._get_column_help(connection, schema,table_name,r['columnname'])
+                    for r in res]
+
+        return [dict((key, row[key]) for key in COLUMN_KEYS) for row in res]
 
     def _get_default_schema_name(self, connection):
         return self.normalize_name(
@@ -258,14 +552,14 @@ class TeradataDialect(default.DefaultDialect):
                       and_(text('DatabaseName = :schema'),
                           or_(text('tablekind=\'T\''),
                               text('tablekind=\'O\''))))
-        res = connection.execute(stmt, schema=schema).fetchall()
+        res = connection.execute(self._dictionary_query(stmt), schema=schema).fetchall()
         return [self.normalize_name(name['tablename']) for name in res]
 
     def get_schema_names(self, connection, **kw):
         stmt = select([column('username')],
                from_obj=[text('dbc.UsersV')],
                order_by=[text('username')])
-        res = connection.execute(stmt).fetchall()
+        res = connection.execute(self._dictionary_query(stmt)).fetchall()
         return [self.normalize_name(name['username']) for name in res]
 
     def get_view_definition(self, connection, view_name, schema=None, **kw):
@@ -286,41 +580,105 @@ class TeradataDialect(default.DefaultDialect):
                       and_(text('DatabaseName = :schema'),
                            text('tablekind=\'V\'')))
 
-        res = connection.execute(stmt, schema=schema).fetchall()
+        res = connection.execute(self._dictionary_query(stmt), schema=schema).fetchall()
         return [self.normalize_name(name['tablename']) for name in res]
 
+    def _indices_query(self, schema_only=False):
+        stmt = select([column('TableName'), column('IndexNumber'), column('IndexType'),
+                       column('UniqueFlag'), column('IndexName'), column('ColumnName')],
+                      from_obj=[text('dbc.Indices')])
+        if schema_only:
+            return stmt.where(text('DatabaseName = :schema')).order_by(
+                                asc(column('TableName')), asc(column('IndexNumber')),
+                                asc(column('ColumnPosition')))
+        return stmt.where(and_(text('DatabaseName = :schema'),
+                               text('TableName = :table'))).order_by(
+                            asc(column('IndexNumber')), asc(column('ColumnPosition')))
+
+    def _index_rows(self, connection, table_name, schema, info_cache=None):
+        """
+        The dbc.Indices rows of a table, from which its primary key, unique
+        constraints and indexes are all derived. They are kept in the
+        info_cache of the Inspector, so reflecting a table reads dbc.Indices
+        once, or not at all after a get_multi_ method read the whole schema.
+        """
+        if info_cache is None:
+            info_cache = {}
+        tables = info_cache.get(('teradata_indices', schema))
+        if tables is not None:
+            return tables.get(self.normalize_name(table_name), [])
+
+        key = ('teradata_indices', schema, table_name)
+        if key not in info_cache:
+            info_cache[key] = connection.execute(self._dictionary_query(self._indices_query()),
+                                                 schema=schema, table=table_name).fetchall()
+        return info_cache[key]
+
+    def _schema_index_rows(self, connection, schema, info_cache=None):
+        """
+        The dbc.Indices rows of all the tables of a schema, by table name,
+        read in a single query.
+        """
+        if info_cache is None:
+            info_cache = {}
+        key = ('teradata_indices', schema)
+        if key not in info_cache:
+            res = connection.execute(self._dictionary_query(self._indices_query(True)),
+                                     schema=schema)
+            tables = {}
+            for table_name, rows in groupby(res, lambda row: row['TableName']):
+                tables.setdefault(self.normalize_name(table_name), []).extend(rows)
+            info_cache[key] = tables
+        return info_cache[key]
+
+    def _group_indexes(self, rows, *index_types):
+        """
+        Groups index rows by IndexNumber, for the given index types (all if
+        none given), into dicts of name, index_type, unique and column_names.
+        Unnamed indexes are named None.
+        """
+        for number, index_rows in groupby(rows, lambda row: row['IndexNumber']):
+            index_rows = list(index_rows)
+            first = index_rows[0]
+            if index_types and first['IndexType'] not in index_types:
+                continue
+            yield {
+                'name': self.normalize_name(first['IndexName']),
+                'index_type': first['IndexType'],
+                'unique': first['UniqueFlag'] == 'Y',
+                'column_names': [self.normalize_name(row['ColumnName']) for row in index_rows]
+            }
+
+    def _pk_constraint(self, rows):
+        # K for Primary Key
+        for index in self._group_indexes(rows, 'K'):
+            return {'constrained_columns': index['column_names'], 'name': index['name']}
+        return {'constrained_columns': [], 'name': None}
+
+    def _unique_constraints(self, rows):
+        # U for Unique
+        return [{'name': index['name'], 'column_names': index['column_names']}
+                for index in self._group_indexes(rows, 'U')]
+
+    def _indexes(self, rows):
+        return [{'name': index['name'], 'column_names': index['column_names'],
+                 'unique': index['unique']}
+                for index in self._group_indexes(rows)]
+
+    @_snapshot_cache
     def get_pk_constraint(self, connection, table_name, schema=None, **kw):
         """
         Override
         TODO: Check if we need PRIMARY Indices or PRIMARY KEY Indices
-        TODO: Check for border cases (No PK Indices)
         """
 
         if schema is None:
             schema = self.default_schema_name
 
-        stmt = select([column('ColumnName'), column('IndexName')],
-                      from_obj=[text('dbc.Indices')]).where(
-                          and_(text('DatabaseName = :schema'),
-                              text('TableName=:table'),
-                              text('IndexType=:indextype'))
-                      ).order_by(asc(column('IndexNumber')))
-
-        # K for Primary Key
-        res = connection.execute(stmt, schema=schema, table=table_name, indextype='K').fetchall()
-
-        index_columns = list()
-        index_name = None
-
-        for index_column in res:
-            index_columns.append(self.normalize_name(index_column['ColumnName']))
-            index_name = self.normalize_name(index_column['IndexName']) # There should be just one IndexName
-
-        return {
-            "constrained_columns": index_columns,
-            "name": index_name
-        }
+        return self._pk_constraint(self._index_rows(connection, table_name, schema,
+                                                    kw.get('info_cache')))
 
+    @_snapshot_cache
     def get_unique_constraints(self, connection, table_name, schema=None, **kw):
         """
         Overrides base class method
@@ -328,34 +686,10 @@ class TeradataDialect(default.DefaultDialect):
         if schema is None:
             schema = self.default_schema_name
 
-        stmt = select([column('ColumnName'), column('IndexName')], from_obj=[text('dbc.Indices')]) \
-            .where(and_(text('DatabaseName = :schema'),
-                        text('TableName=:table'),
-                        text('IndexType=:indextype'))) \
-            .order_by(asc(column('IndexName')))
-
-        # U for Unique
-        res = connection.execute(stmt, schema=schema, table=table_name, indextype='U').fetchall()
-
-        def grouper(fk_row):
-            return {
-                'name': self.normalize_name(fk_row['IndexName']),
-            }
-
-        unique_constraints = list()
-        for constraint_info, constraint_cols in groupby(res, grouper):
-            unique_constraint = {
-                'name': self.normalize_name(constraint_info['name']),
-                'column_names': list()
-            }
-
-            for constraint_col in constraint_cols:
-                unique_constraint['column_names'].append(self.normalize_name(constraint_col['ColumnName']))
-
-            unique_constraints.append(unique_constraint)
-
-        return unique_constraints
+        return self._unique_constraints(self._index_rows(connection, table_name, schema,
+                                                         kw.get('info_cache')))
 
+    @_snapshot_cache
     def get_foreign_keys(self, connection, table_name, schema=None, **kw):
         """
         Overrides base class method
@@ -371,7 +705,8 @@ class TeradataDialect(default.DefaultDialect):
                         text('ChildDB = :schema'))) \
             .order_by(asc(column('IndexID')))
 
-        res = connection.execute(stmt, schema=schema, table=table_name).fetchall()
+        res = connection.execute(self._dictionary_query(stmt),
+                                 schema=schema, table=table_name).fetchall()
 
         def grouper(fk_row):
             return {
@@ -399,6 +734,7 @@ class TeradataDialect(default.DefaultDialect):
 
         return fk_dicts
 
+    @_snapshot_cache
     def get_indexes(self, connection, table_name, schema=None, **kw):
         """
         Overrides base class method
@@ -407,34 +743,30 @@ class TeradataDialect(default.DefaultDialect):
         if schema is None:
             schema = self.default_schema_name
 
-        stmt = select(["*"], from_obj=[text('dbc.Indices')]) \
-            .where(and_(text('DatabaseName = :schema'),
-                        text('TableName=:table'))) \
-            .order_by(asc(column('IndexName')))
-
-        res = connection.execute(stmt, schema=schema, table=table_name).fetchall()
+        return self._indexes(self._index_rows(connection, table_name, schema,
+                                              kw.get('info_cache')))
 
-        def grouper(fk_row):
-            return {
-                'name': fk_row.IndexName or fk_row.IndexNumber, # If IndexName is None TODO: Check what to do
-                'unique': True if fk_row.UniqueFlag == 'Y' else False
-            }
-
-        # TODO: Check if there's a better way
-        indices = list()
-        for index_info, index_cols in groupby(res, grouper):
-            index_dict = {
-                'name': index_info['name'],
-                'column_names': list(),
-                'unique': index_info['unique']
-            }
+    def _get_multi(self, derive, connection, schema=None, filter_names=None, **kw):
+        """
+        Derives the result of derive for the tables of schema (or those of
+        filter_names) from a single scan of dbc.Indices, keyed by
+        (schema, table_name) with schema as given.
+        """
+        if filter_names is None:
+            filter_names = self.get_table_names(connection, schema)
+        tables = self._schema_index_rows(connection, schema or self.default_schema_name,
+                                         kw.get('info_cache'))
+        return dict(((schema, name), derive(tables.get(self.normalize_name(name), [])))
+                    for name in filter_names)
 
-            for index_col in index_cols:
-                index_dict['column_names'].append(self.normalize_name(index_col['ColumnName']))
+    def get_multi_pk_constraint(self, connection, schema=None, filter_names=None, **kw):
+        return self._get_multi(self._pk_constraint, connection, schema, filter_names, **kw)
 
-            indices.append(index_dict)
+    def get_multi_unique_constraints(self, connection, schema=None, filter_names=None, **kw):
+        return self._get_multi(self._unique_constraints, connection, schema, filter_names, **kw)
 
-        return indices
+    def get_multi_indexes(self, connection, schema=None, filter_names=None, **kw):
+        return self._get_multi(self._indexes, connection, schema, filter_names, **kw)
 
     def get_transaction_mode(self, connection, **kw):
         """
@@ -446,7 +778,7 @@ class TeradataDialect(default.DefaultDialect):
                 from_obj=[text('dbc.sessioninfov')]).\
                 where(text('sessionno=SESSION'))
 
-        res = connection.execute(stmt).scalar()
+        res = connection.execute(self._dictionary_query(stmt)).scalar()
         return res
 
     def _get_server_version_info(self, connection, **kw):
@@ -457,7 +789,7 @@ class TeradataDialect(default.DefaultDialect):
                 from_obj=[text('dbc.dbcinfov')]).\
                 where(text('InfoKey=\'VERSION\''))
 
-        res = connection.execute(stmt).scalar()
+        res = connection.execute(self._dictionary_query(stmt)).scalar()
         return res
 
     def conn_supports_autocommit(self, connection, **kw):
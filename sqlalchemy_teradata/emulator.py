@@ -0,0 +1,1156 @@
+# sqlalchemy_teradata/emulator.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+An in-process emulation of the Teradata DBAPI, backed by SQLite, to test
+and benchmark the dialect without a Teradata system:
+
+    from sqlalchemy_teradata import emulator
+
+    engine = create_engine('teradata://user:pw@sandbox', module=emulator)
+
+It accepts the SQL the dialect emits: TOP, the Teradata table options and
+column attributes of CREATE TABLE, HELP COLUMN, SHOW, EXPLAIN,
+SET QUERY_BAND, LOCKING modifiers, multi-statement requests, HASHROW,
+HASHBUCKET and MOD. The DBC views read by reflection (dbc.TablesV[X],
+dbc.ColumnsV, dbc.ColumnsQV, dbc.Indices, DBC.All_RI_ChildrenV, dbc.UsersV,
+dbc.dbcinfov, dbc.sessioninfov, dbc.RestrictedWordsV) are tables kept up to date by the DDL run
+through the emulator, and can be loaded with synthetic rows directly.
+
+Connections to the same system share an in-memory database, which is the
+default database of the user (or of the database connection parameter).
+The server version can be set with the version connection parameter.
+With convert_types=False, DECIMAL, DATE, TIMESTAMP and TIME values are
+returned in their stored string (or number) forms, like tdodbc with a
+dataTypeConverter that leaves values alone.
+
+Every request is counted in the module level stats and in the stats of its
+connection: requests, round trips, prepares, bytes sent and received and the
+elapsed time. Like tdodbc and teradatasql, a request with parameters is
+prepared on every execute, whatever the cursor, and setinputsizes() does
+nothing. executemany() sends a request per parameter row on the connections
+of tdodbc, unless given batch=True, and a single request on those of
+teradatasql. Results larger than response_buffer_size take one more round trip
+per buffer, and latency adds a simulated network delay to each round trip.
+"""
+
+import datetime
+import decimal
+import itertools
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from sqlalchemy_teradata.base import ReservedWords
+
+apilevel = '2.0'
+threadsafety = 1
+paramstyle = 'qmark'
+
+Binary = bytes
+
+Warning = sqlite3.Warning
+Error = sqlite3.Error
+InterfaceError = sqlite3.InterfaceError
+DatabaseError = sqlite3.DatabaseError
+DataError = sqlite3.DataError
+OperationalError = sqlite3.OperationalError
+IntegrityError = sqlite3.IntegrityError
+InternalError = sqlite3.InternalError
+ProgrammingError = sqlite3.ProgrammingError
+NotSupportedError = sqlite3.NotSupportedError
+
+VERSION = '16.20.00.00'
+
+# simulated network delay of a round trip, in seconds
+latency = 0.0
+
+# the size of a response message (the ODBC default MaxRespSize)
+response_buffer_size = 64 * 1024
+
+# a query running until it is cancelled, for tests of cancellation
+ENDLESS_QUERY = ('WITH RECURSIVE r(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM r) '
+                 'SELECT count(*) FROM r')
+
+
+class Stats(object):
+    """
+    Counters of the requests sent to the emulator.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.round_trips = 0
+        self.prepares = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.elapsed = 0.0
+        self.statements = []
+
+    def _add(self, statements=(), **counts):
+        with self._lock:
+            for key, value in counts.items():
+                setattr(self, key, getattr(self, key) + value)
+            self.statements.extend(statements)
+
+    def as_dict(self):
+        return {'requests': self.requests,
+                'round_trips': self.round_trips,
+                'prepares': self.prepares,
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'elapsed': self.elapsed}
+
+
+stats = Stats()
+
+
+# DBC views and their bookkeeping tables, in the attached dbc database
+_DBC_SCHEMA = """
+CREATE TABLE dbc.dbcinfov (InfoKey COLLATE NOCASE, InfoData);
+CREATE TABLE dbc.sessioninfov (SessionNo, UserName COLLATE NOCASE,
+                               Transaction_Mode);
+CREATE TABLE dbc.UsersV (UserName COLLATE NOCASE);
+CREATE TABLE dbc.TablesV (DatabaseName COLLATE NOCASE, TableName COLLATE NOCASE,
+                          TableKind, CreateTimeStamp, LastAlterTimeStamp,
+                          RequestText, CommentString);
+CREATE INDEX dbc.TablesV_Name ON TablesV (DatabaseName, TableName);
+CREATE VIEW dbc.TablesVX AS SELECT * FROM TablesV;
+CREATE TABLE dbc.ColumnsQV (DatabaseName COLLATE NOCASE, TableName COLLATE NOCASE,
+                            ColumnName COLLATE NOCASE, ColumnId, ColumnType,
+                            ColumnLength, CharType, DecimalTotalDigits,
+                            DecimalFractionalDigits, ColumnFormat, Nullable,
+                            DefaultValue, IdColType, ColumnTitle, CommentString,
+                            TableKind);
+CREATE INDEX dbc.ColumnsQV_Name ON ColumnsQV (DatabaseName, TableName);
+CREATE VIEW dbc.ColumnsV AS
+    SELECT DatabaseName, TableName, ColumnName, ColumnId,
+           CASE WHEN TableKind = 'V' AND
+                     (SELECT InfoData FROM dbcinfov WHERE InfoKey = 'VERSION') < '16'
+                THEN NULL ELSE ColumnType END AS ColumnType,
+           ColumnLength, CharType, DecimalTotalDigits, DecimalFractionalDigits,
+           ColumnFormat, Nullable, DefaultValue, IdColType, ColumnTitle,
+           CommentString
+    FROM ColumnsQV;
+CREATE TABLE dbc.Indices (DatabaseName COLLATE NOCASE, TableName COLLATE NOCASE,
+                          IndexNumber, IndexType, UniqueFlag, IndexName,
+                          ColumnName, ColumnPosition);
+CREATE INDEX dbc.Indices_Name ON Indices (DatabaseName, TableName);
+CREATE VIEW dbc.IndicesV AS SELECT * FROM Indices;
+CREATE TABLE dbc.All_RI_ChildrenV (IndexID, IndexName, ChildDB COLLATE NOCASE,
+                                   ChildTable COLLATE NOCASE, ChildKeyColumn,
+                                   ParentDB, ParentTable, ParentKeyColumn);
+CREATE TABLE dbc.RestrictedWordsV (restricted_word, category);
+CREATE TABLE dbc._PrimaryIndexes (TableName COLLATE NOCASE, IndexType, UniqueFlag,
+                                  IndexName, ColumnNames);
+CREATE TABLE dbc._ColumnAttrs (TableName COLLATE NOCASE, ColumnName COLLATE NOCASE,
+                               ColumnFormat, IdColType, ColumnTitle);
+"""
+
+# the rows of dbc.RestrictedWordsV: the built-in reserved words of the
+# dialect and more, and some nonreserved words
+_RESTRICTED_WORDS = ([(w.upper(), 'R') for w in sorted(ReservedWords | set([
+                        'select', 'from', 'where', 'group', 'having', 'qualify', 'sample',
+                        'table', 'view', 'index', 'column', 'update', 'delete', 'insert',
+                        'date', 'type', 'role', 'range_n', 'top']))] +
+                     [(w.upper(), 'N') for w in ('name', 'data', 'message', 'source')])
+
+_init_lock = threading.Lock()
+_sessions = itertools.count(1000)
+
+
+def connect(dbType='Teradata', system=None, username=None, password=None,
+            **kwargs):
+    """
+    Connects with the arguments of tdodbc (dbType, system, username,
+    password) or the parameters of teradatasql (host, user, database).
+    """
+    # teradatasql is given host, tdodbc system
+    batches = kwargs.get('host') is not None
+    system = system or kwargs.get('host') or 'emulator'
+    database = kwargs.get('database') or username or kwargs.get('user') or 'dbc'
+    return Connection(system, database, kwargs.get('version'),
+                      kwargs.get('convert_types', True), batches)
+
+
+# Python values sqlite3 does not bind
+_adapters = {
+    decimal.Decimal: str,
+    datetime.date: datetime.date.isoformat,
+    datetime.datetime: lambda v: v.isoformat(' '),
+    datetime.time: datetime.time.isoformat,
+    datetime.timedelta: str,
+    bytearray: bytes,
+    memoryview: bytes,
+}
+
+
+def _adapt(params):
+    if not params:
+        return ()
+    return [_adapters[type(p)](p) if type(p) in _adapters else p for p in params]
+
+
+def _size(value):
+    if value is None:
+        return 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    return len(str(value))
+
+
+def _row_size(row):
+    return sum(_size(v) for v in row)
+
+
+def _timestamp():
+    return datetime.datetime.now().isoformat(' ')
+
+
+# results are converted by the declared column types; the TD_ prefix
+# keeps these converters from applying to other sqlite3 connections
+for _name, _converter in (
+        ('TD_DATE', lambda v: datetime.datetime.strptime(v.decode(), '%Y-%m-%d').date()),
+        ('TD_TIMESTAMP', lambda v: _parse_datetime(v.decode())),
+        ('TD_TIME', lambda v: _parse_time(v.decode())),
+        ('TD_DECIMAL', lambda v: decimal.Decimal(v.decode())),
+        ('TD_NUMBER', lambda v: decimal.Decimal(v.decode()))):
+    sqlite3.register_converter(_name, _converter)
+
+
+def _parse_datetime(value):
+    value = value.replace('T', ' ')
+    for fmt in ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(value[:26], fmt)
+        except ValueError:
+            pass
+    return value
+
+
+def _parse_time(value):
+    for fmt in ('%H:%M:%S.%f', '%H:%M:%S'):
+        try:
+            return datetime.datetime.strptime(value[:15], fmt).time()
+        except ValueError:
+            pass
+    return value
+
+
+def _hashrow(*values):
+    return zlib.crc32(repr(values).encode('utf-8')) & 0xffffffff
+
+
+def _hashbucket(rowhash):
+    return None if rowhash is None else rowhash >> 12
+
+
+def _zeroifnull(value):
+    return 0 if value is None else value
+
+
+def _nullifzero(value):
+    return None if value == 0 else value
+
+
+def _bytes(value):
+    if value is None:
+        return None
+    return len(value.encode('utf-8') if isinstance(value, str) else value)
+
+
+def _concat(a, b):
+    # || of SQLite gives TEXT for BLOBs, Teradata concatenates the bytes
+    if a is None or b is None:
+        return None
+    if isinstance(a, str) and isinstance(b, str):
+        return a + b
+    to_bytes = lambda v: v.encode('utf-8') if isinstance(v, str) else bytes(v)
+    return to_bytes(a) + to_bytes(b)
+
+
+#
+# SQL translation
+#
+
+_LITERAL = re.compile(r"('(?:[^']|'')*')")
+
+
+def _code_segments(sql, fn):
+    """
+    Applies fn to the parts of sql outside string literals.
+    """
+    parts = _LITERAL.split(sql)
+    for i in range(0, len(parts), 2):
+        parts[i] = fn(parts[i])
+    return ''.join(parts)
+
+
+def _number_params(sql):
+    numbers = itertools.count(1)
+    return _code_segments(sql, lambda text: re.sub(r'\?', lambda m: '?%d' % next(numbers), text))
+
+
+def _closing(sql, pos):
+    """
+    Returns the index of the parenthesis closing the one enclosing pos,
+    or len(sql).
+    """
+    depth, quote = 0, None
+    for i in range(pos, len(sql)):
+        ch = sql[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '\'"':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            if depth == 0:
+                return i
+            depth -= 1
+    return len(sql)
+
+
+def _split(sql, sep):
+    """
+    Splits sql on sep outside parentheses and quotes.
+    """
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(sql):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '\'"':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(sql[start:i])
+            start = i + 1
+    parts.append(sql[start:])
+    return parts
+
+
+def _count_params(sql):
+    return _LITERAL.sub('', sql).count('?')
+
+
+def _unquote(name):
+    name = name.strip()
+    if name.startswith('"') and name.endswith('"'):
+        return name[1:-1].replace('""', '"')
+    return name
+
+
+def _quote_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+_NAME = r'(?:"(?:[^"]|"")+"|[\w$#]+)'
+_QNAME = _NAME + r'(?:\s*\.\s*' + _NAME + r')*'
+
+# the (column || ?) of the UPDATE statements appending to a LOB
+_CONCAT = re.compile(r'\(\s*(' + _QNAME + r')\s*\|\|\s*(\?)\s*\)')
+_TOP = re.compile(r'\bSELECT\s+(DISTINCT\s+)?TOP\s+(\d+|\?\d*)\s+(?:WITH\s+TIES\s+)?', re.I)
+_LOCKING = re.compile(r'^\s*LOCK(?:ING)?\s+(?:(?:ROW|TABLE\s+' + _QNAME + r'|VIEW\s+' +
+                      _QNAME + r'|DATABASE\s+' + _NAME + r')\s+)?(?:FOR|IN)\s+'
+                      r'(?:ACCESS|READ|WRITE|EXCLUSIVE)(?:\s+MODE)?\s*', re.I)
+_QUERY_BAND = re.compile(r'^\s*SET\s+QUERY_BAND\b', re.I)
+_NOOP = re.compile(r'^\s*(?:BT|ET|BEGIN\s+TRANSACTION|END\s+TRANSACTION|COMMENT\s+ON|'
+                   r'GRANT|REVOKE|DATABASE|COLLECT\s+STAT)', re.I)
+_HELP_COLUMN = re.compile(r'^\s*HELP\s+COLUMN\s+(' + _QNAME + r'|' + _QNAME + r'\.\*)\s*$', re.I)
+_SHOW = re.compile(r'^\s*SHOW\s+(?:TABLE|VIEW)\s+(' + _QNAME + r')\s*$', re.I)
+_EXPLAIN = re.compile(r'^\s*EXPLAIN\s+', re.I)
+_SELECT_DATABASE = re.compile(r'^\s*select\s+database\s*$', re.I)
+
+_CREATE_TABLE = re.compile(r'^\s*CREATE\s+((?:(?:SET|MULTISET|VOLATILE|GLOBAL\s+TEMPORARY)\s+)*)'
+                           r'TABLE\s+(' + _QNAME + r')', re.I)
+_CREATE_VIEW = re.compile(r'^\s*(CREATE|REPLACE)\s+(?:RECURSIVE\s+)?VIEW\s+(' + _QNAME +
+                          r')\s*(\([^)]*\))?\s+AS\s+(.*)$', re.I | re.S)
+_TD_CREATE_INDEX = re.compile(r'^\s*CREATE\s+(UNIQUE\s+)?INDEX\s*(' + _NAME + r')?\s*'
+                              r'\(([^)]*)\)\s*ON\s+(' + _QNAME + r')\s*$', re.I)
+_CREATE_INDEX = re.compile(r'^\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(' + _QNAME + r')\s+ON\s+(' +
+                           _QNAME + r')\s*\(([^)]*)\)\s*$', re.I)
+_DROP = re.compile(r'^\s*DROP\s+(TABLE|VIEW)\s+(' + _QNAME + r')\s*$', re.I)
+_DROP_INDEX = re.compile(r'^\s*DROP\s+INDEX\s+(' + _QNAME + r')(?:\s+ON\s+(' + _QNAME + r'))?\s*$',
+                         re.I)
+_ALTER = re.compile(r'^\s*ALTER\s+TABLE\s+(' + _QNAME + r')\s+(.*)$', re.I | re.S)
+_RENAME = re.compile(r'^\s*RENAME\s+TABLE\s+(' + _QNAME + r')\s+(?:TO|AS)\s+(' + _QNAME +
+                     r')\s*$', re.I)
+
+_PRIMARY_INDEX = re.compile(r'\b(UNIQUE\s+)?PRIMARY\s+(?:AMP\s+)?INDEX\s*(' + _NAME +
+                            r')?\s*\(([^)]*)\)', re.I)
+_NO_PRIMARY_INDEX = re.compile(r'\bNO\s+PRIMARY\s+INDEX\b', re.I)
+_PARTITION = re.compile(r'\bPARTITION\s+BY\b', re.I)
+_SECONDARY_INDEX = re.compile(r'(?<!PRIMARY )\b(UNIQUE\s+)?INDEX\s*(' + _NAME + r')?\s*'
+                              r'\(([^)]*)\)', re.I)
+
+_COLUMN_ATTRIBUTES = set(['NOT', 'NULL', 'DEFAULT', 'PRIMARY', 'UNIQUE', 'REFERENCES',
+                          'CHECK', 'CONSTRAINT', 'GENERATED', 'FORMAT', 'TITLE',
+                          'COMPRESS', 'CASESPECIFIC', 'UPPERCASE', 'COLLATE', 'NAMED'])
+_TABLE_CONSTRAINTS = re.compile(r'^\s*(?:CONSTRAINT|PRIMARY\s+KEY|UNIQUE|FOREIGN\s+KEY|'
+                                r'CHECK)\b', re.I)
+_TOKEN = re.compile(r'\s*("(?:[^"]|"")*"|\'(?:[^\']|\'\')*\'|[\w$#.+-]+|\(|\S)')
+
+
+def _tokens(text):
+    """
+    Splits a column definition into words, literals and parenthesized groups.
+    """
+    tokens, pos = [], 0
+    while True:
+        m = _TOKEN.match(text, pos)
+        if not m:
+            return tokens
+        if m.group(1) == '(':
+            end = _closing(text, m.end())
+            tokens.append(text[m.start(1):end + 1])
+            pos = end + 1
+        else:
+            tokens.append(m.group(1))
+            pos = m.end()
+
+
+def _encode_type(words):
+    """
+    Encodes a Teradata data type as a SQLite type name, e.g.
+    TIMESTAMP(6) WITH TIME ZONE as TD_TIMESTAMP __6 WITH TIME ZONE.
+    SET and TO are SQLite keywords, so CHARACTER SET becomes CHARSET
+    and TO becomes TO_.
+    """
+    res = []
+    for word in words:
+        if word.startswith('('):
+            res.append('__' + re.sub(r'\W', '_', word[1:-1].strip()))
+        elif word.upper() == 'SET' and res and res[-1] in ('CHAR', 'CHARACTER'):
+            res[-1] = 'CHARSET'
+        else:
+            res.append('TO_' if word.upper() == 'TO' else word.upper())
+    return 'TD_' + ' '.join(res)
+
+
+def _column_def(text, attrs):
+    """
+    Translates a column definition, collecting the Teradata only
+    attributes into attrs.
+    """
+    tokens = _tokens(text)
+    name, rest = tokens[0], tokens[1:]
+    i = 0
+    while i < len(rest) and rest[i].upper() not in _COLUMN_ATTRIBUTES:
+        i += 1
+    out = [name, _encode_type(rest[:i])]
+    rest = rest[i:]
+
+    col = {'name': _unquote(name)}
+    i = 0
+    while i < len(rest):
+        word = rest[i].upper()
+        nxt = rest[i + 1].upper() if i + 1 < len(rest) else None
+        if word == 'GENERATED':
+            col['idcoltype'] = 'GD' if nxt == 'BY' else 'GA'
+            i += 1
+            while i < len(rest) and rest[i].upper() != 'IDENTITY':
+                i += 1
+            i += 1
+            if i < len(rest) and rest[i].startswith('('):
+                i += 1
+        elif word in ('FORMAT', 'TITLE', 'NAMED'):
+            if word == 'FORMAT':
+                col['format'] = rest[i + 1][1:-1]
+            elif word == 'TITLE':
+                col['title'] = rest[i + 1][1:-1]
+            i += 2
+        elif word == 'COMPRESS':
+            i += 1
+            if i < len(rest) and (rest[i].startswith(('(', "'")) or
+                                  re.match(r'^[\d.+-]+$', rest[i]) or rest[i].upper() == 'NULL'):
+                i += 1
+        elif word in ('CASESPECIFIC', 'UPPERCASE'):
+            i += 1
+        elif word == 'NOT' and nxt == 'CASESPECIFIC':
+            i += 2
+        elif word == 'DEFAULT':
+            out += rest[i:i + 2]
+            i += 2
+            if i < len(rest) and rest[i].startswith('(') and \
+                            out[-1].upper().startswith('CURRENT_'):
+                i += 1
+        else:
+            out.append(rest[i])
+            i += 1
+    attrs.append(col)
+    return ' '.join(out)
+
+
+# data type code, length, character set of the Teradata data types
+_TYPE_CODES = {
+    'BYTEINT': ('I1', 1), 'SMALLINT': ('I2', 2), 'INTEGER': ('I', 4), 'INT': ('I', 4),
+    'BIGINT': ('I8', 8), 'FLOAT': ('F', 8), 'REAL': ('F', 8), 'DOUBLE PRECISION': ('F', 8),
+    'DATE': ('DA', 4), 'BLOB': ('BO', 2097088000), 'BYTE': ('BF', 1),
+    'VARBYTE': ('BV', 1), 'BOOLEAN': ('I1', 1),
+}
+_INTERVAL_CODES = {
+    'YEAR': 'YR', 'YEAR TO MONTH': 'YM', 'MONTH': 'MO', 'DAY': 'DY', 'DAY TO HOUR': 'DH',
+    'DAY TO MINUTE': 'DM', 'DAY TO SECOND': 'DS', 'HOUR': 'HR', 'HOUR TO MINUTE': 'HM',
+    'HOUR TO SECOND': 'HS', 'MINUTE': 'MI', 'MINUTE TO SECOND': 'MS', 'SECOND': 'SC',
+}
+_CHARSETS = {'LATIN': 1, 'UNICODE': 2, 'KANJISJIS': 3, 'GRAPHIC': 4}
+_INT_FORMATS = {'I1': '-(3)9', 'I2': '-(5)9', 'I': '-(10)9', 'I8': '-(19)9'}
+
+
+def _decode_type(decltype):
+    """
+    Returns the dictionary columns (ColumnType, ColumnLength, CharType,
+    DecimalTotalDigits, DecimalFractionalDigits, ColumnFormat) of a type
+    encoded by _encode_type().
+    """
+    if not decltype or not decltype.startswith('TD_'):
+        return (None, None, None, None, None, None)
+
+    # the words of the type and the arguments that follow each of them
+    words, args = [], {}
+    for word in decltype[3:].split():
+        if word.startswith('__') and words:
+            args[words[-1]] = [a for a in word[2:].split('_') if a]
+        else:
+            words.append('TO' if word == 'TO_' else word)
+
+    charset = None
+    if 'CHARSET' in words and words.index('CHARSET') + 1 < len(words):
+        charset = words[words.index('CHARSET') + 1]
+        words = words[:words.index('CHARSET')]
+    tz = words[-3:] == ['WITH', 'TIME', 'ZONE']
+    if tz:
+        words = words[:-3]
+    name = ' '.join(words)
+    arg = lambda word, i, default: int(args[word][i]) \
+                    if len(args.get(word, ())) > i and args[word][i].isdigit() else default
+
+    def lob_length(word):
+        # the length of a CLOB or BLOB with an optional K, M or G multiplier
+        if not args.get(word):
+            return 2097088000
+        n = args[word][0]
+        return int(n.rstrip('KMG')) * {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}.get(n[-1], 1)
+
+    if name in ('CHAR', 'CHARACTER', 'VARCHAR', 'LONG VARCHAR', 'CLOB',
+                'GRAPHIC', 'VARGRAPHIC'):
+        charset = charset or ('GRAPHIC' if 'GRAPHIC' in name else 'LATIN')
+        if name == 'LONG VARCHAR':
+            length = 64000
+        elif name == 'CLOB':
+            length = lob_length(name)
+        else:
+            length = arg(name, 0, 1)
+        code = 'CF' if name in ('CHAR', 'CHARACTER', 'GRAPHIC') else \
+               'CO' if name == 'CLOB' else 'CV'
+        width = 2 if charset in ('UNICODE', 'GRAPHIC') else 1
+        return (code, length * width, _CHARSETS.get(charset), None, None,
+                'X({})'.format(length))
+
+    if name in ('DECIMAL', 'NUMERIC', 'DEC', 'NUMBER'):
+        prec = arg(name, 0, 38 if name == 'NUMBER' else 5)
+        scale = arg(name, 1, 0)
+        fmt = '-({}){}'.format(prec - scale, '.9({})'.format(scale) if scale else '9')
+        return ('N' if name == 'NUMBER' else 'D', 8 if prec > 18 else 4 if prec > 9 else 2,
+                None, prec, scale, fmt)
+
+    if name in ('TIME', 'TIMESTAMP'):
+        prec = arg(name, 0, 6)
+        fmt = 'HH:MI:SS' if name == 'TIME' else 'YYYY-MM-DDBHH:MI:SS'
+        if prec:
+            fmt += '.S({})'.format(prec)
+        if tz:
+            fmt += 'Z'
+        code = {('TIME', False): 'AT', ('TIME', True): 'TZ',
+                ('TIMESTAMP', False): 'TS', ('TIMESTAMP', True): 'SZ'}[name, tz]
+        return (code, 20 + prec, None, None, prec, fmt)
+
+    if words[0] == 'INTERVAL' and len(words) > 1:
+        prec = arg(words[1], 0, 2)
+        frac = arg('SECOND', 1 if words[1:] == ['SECOND'] else 0, 6) \
+                        if words[-1] == 'SECOND' else None
+        return (_INTERVAL_CODES.get(' '.join(words[1:])), 8, None, prec, frac, None)
+
+    if name == 'PERIOD' and args.get(name):
+        inner = args[name]
+        tz = inner[-1] == 'ZONE'
+        code = 'PD' if inner[0] == 'DATE' else \
+               ('PZ' if tz else 'PT') if inner[0] == 'TIME' else ('PM' if tz else 'PS')
+        prec = None if code == 'PD' else \
+               int(inner[1]) if len(inner) > 1 and inner[1].isdigit() else 6
+        return (code, 8, None, None, prec, None)
+
+    if name in _TYPE_CODES:
+        code, length = _TYPE_CODES[name]
+        if code in ('BF', 'BV'):
+            length = arg(name, 0, 1)
+            return (code, length, None, None, None, 'X({})'.format(2 * length))
+        if code == 'BO':
+            return (code, lob_length(name), None, None, None, None)
+        fmt = _INT_FORMATS.get(code, 'YY/MM/DD' if code == 'DA' else
+                               '-9.99999999999999E-999' if code == 'F' else None)
+        return (code, length, None, None, None, fmt)
+
+    return (None, None, None, None, None, None)
+
+
+class _Plan(object):
+    """
+    The translation of one statement: kind is 'query', 'noop', 'ddl',
+    'explain' or 'help'; for DDL, actions holds (action, args) tuples
+    applied to the dictionary after the SQLite statements.
+    """
+
+    def __init__(self, kind, sql=(), actions=(), text=None):
+        self.kind = kind
+        self.sql = sql
+        self.actions = actions
+        self.text = text
+
+
+class Connection(object):
+
+    def __init__(self, system, database, version=None, convert_types=True, batches=False):
+        self.system = system
+        self.database = database
+        self.batches = batches
+        self.session = next(_sessions)
+        self.stats = Stats()
+        self._translated = {}
+        self._prefix = re.compile(r'(?<![\w$#."])(?:"' + re.escape(database) + r'"|' +
+                                  re.escape(database) + r')\s*\.\s*(?=[\w"$#])', re.I)
+
+        self._conn = sqlite3.connect('file:{}?mode=memory&cache=shared'.format(system),
+                                     uri=True, check_same_thread=False,
+                                     detect_types=sqlite3.PARSE_DECLTYPES if convert_types else 0)
+        self._conn.create_function('hashrow', -1, _hashrow)
+        self._conn.create_function('hashbucket', 1, _hashbucket)
+        self._conn.create_function('hashamp', 1, lambda b: None if b is None else b % 4)
+        self._conn.create_function('zeroifnull', 1, _zeroifnull)
+        self._conn.create_function('nullifzero', 1, _nullifzero)
+        self._conn.create_function('characters', 1, lambda v: None if v is None else len(v))
+        self._conn.create_function('bytes', 1, _bytes)
+        self._conn.create_function('td_concat', 2, _concat)
+        self._conn.execute("ATTACH 'file:{}_dbc?mode=memory&cache=shared' AS dbc".format(system))
+
+        with _init_lock:
+            c = self._conn
+            if not c.execute('SELECT name FROM dbc.sqlite_master').fetchall():
+                c.executescript(_DBC_SCHEMA)
+                c.execute("INSERT INTO dbc.dbcinfov VALUES ('VERSION', ?)", (version or VERSION,))
+                c.execute("INSERT INTO dbc.dbcinfov VALUES ('RELEASE', ?)",
+                          ('V2R.' + (version or VERSION),))
+                c.execute("INSERT INTO dbc.UsersV VALUES ('dbc')")
+                c.executemany('INSERT INTO dbc.RestrictedWordsV VALUES (?, ?)', _RESTRICTED_WORDS)
+            elif version:
+                c.execute("UPDATE dbc.dbcinfov SET InfoData = ? WHERE InfoKey = 'VERSION'",
+                          (version,))
+            if not c.execute('SELECT 1 FROM dbc.UsersV WHERE UserName = ?',
+                             (database,)).fetchone():
+                c.execute('INSERT INTO dbc.UsersV VALUES (?)', (database,))
+            c.execute("INSERT INTO dbc.sessioninfov VALUES (?, ?, 'T')",
+                      (self.session, database))
+            c.commit()
+
+    def cursor(self):
+        return Cursor(self)
+
+    def cancel(self):
+        self._conn.interrupt()
+
+    def _request(self, sent=0):
+        self._count(requests=1, round_trips=1, bytes_sent=sent)
+
+    def _count(self, statements=(), **counts):
+        if latency and counts.get('round_trips'):
+            time.sleep(latency * counts['round_trips'])
+            counts['elapsed'] = counts.get('elapsed', 0.0) + latency * counts['round_trips']
+        self.stats._add(statements, **counts)
+        stats._add(statements, **counts)
+
+    def commit(self):
+        self._request()
+        self._conn.commit()
+
+    def rollback(self):
+        self._request()
+        self._conn.rollback()
+
+    def close(self):
+        try:
+            self._conn.execute('DELETE FROM dbc.sessioninfov WHERE SessionNo = ?',
+                               (self.session,))
+            self._conn.commit()
+        except sqlite3.Error:
+            pass
+        self._conn.close()
+
+    #
+    # translation
+    #
+
+    def _translate(self, sql):
+        plan = self._translated.get(sql)
+        if plan is None:
+            plan = self._translated[sql] = self._do_translate(sql)
+        return plan
+
+    def _name(self, qname):
+        """
+        The unqualified name of an object of the default database.
+        """
+        parts = [_unquote(p) for p in _split(qname, '.')]
+        if len(parts) > 1 and parts[-2].lower() != self.database.lower():
+            raise OperationalError('Database {} does not exist'.format(parts[-2]))
+        return parts[-1]
+
+    def _expressions(self, sql):
+        """
+        Rewrites the Teradata expressions of a query.
+        """
+        sql = _LOCKING.sub('', sql, count=1)
+        while _LOCKING.match(sql):
+            sql = _LOCKING.sub('', sql, count=1)
+
+        def code(text):
+            text = self._prefix.sub('', text)
+            text = re.sub(r'\bMOD\b', '%', text, flags=re.I)
+            text = re.sub(r'=\s*SESSION\b', '= {}'.format(self.session), text, flags=re.I)
+            text = re.sub(r'\)\s*CHAR(?:ACTER)?\s+SET\s+\w+', ')', text, flags=re.I)
+            text = re.sub(r'\b(CURRENT_(?:TIMESTAMP|TIME))\s*\(\s*\d\s*\)', r'\1', text,
+                          flags=re.I)
+            text = re.sub(r'\b(?:DATE|TIMESTAMP|TIME)\s*$', '', text, flags=re.I)
+            text = _CONCAT.sub(r'td_concat(\1, \2)', text)
+            return text
+        sql = _code_segments(sql, code)
+
+        while True:
+            m = _TOP.search(sql)
+            if not m:
+                return sql
+            if m.group(2) == '?':
+                # the parameter of TOP moves to the end of the query, so
+                # the parameters are numbered to keep their order
+                sql = _number_params(sql)
+                continue
+            end = _closing(sql, m.end())
+            sql = (sql[:m.start()] + 'SELECT ' + (m.group(1) or '') +
+                   sql[m.end():end].rstrip() + ' LIMIT ' + m.group(2) + sql[end:])
+
+    def _do_translate(self, sql):
+        if _SELECT_DATABASE.match(sql):
+            return _Plan('query', ['SELECT ' + _quote_literal(self.database)])
+        if _QUERY_BAND.match(sql) or _NOOP.match(sql):
+            return _Plan('noop')
+
+        m = _HELP_COLUMN.match(sql)
+        if m:
+            parts = [_unquote(p) for p in _split(m.group(1), '.')]
+            cond = 'TableName = ' + _quote_literal(parts[-2])
+            if parts[-1] != '*':
+                cond += ' AND ColumnName = ' + _quote_literal(parts[-1])
+            return _Plan('query', [
+                'SELECT ColumnName AS "Column Name", ColumnType AS "Type", '
+                'Nullable, ColumnFormat AS "Format", ColumnTitle AS "Title", '
+                'ColumnLength AS "Max Length", DecimalTotalDigits AS "Decimal Total Digits", '
+                'DecimalFractionalDigits AS "Decimal Fractional Digits", '
+                'CharType AS "Char Type", IdColType AS "IdCol Type" '
+                'FROM dbc.ColumnsQV WHERE DatabaseName = ' +
+                _quote_literal(parts[-3] if len(parts) > 2 else self.database) +
+                ' AND ' + cond + ' ORDER BY ColumnId'])
+
+        m = _SHOW.match(sql)
+        if m:
+            return _Plan('query', ['SELECT RequestText FROM dbc.TablesV WHERE DatabaseName = ' +
+                                   _quote_literal(self.database) + ' AND TableName = ' +
+                                   _quote_literal(self._name(m.group(1)))])
+
+        if _EXPLAIN.match(sql):
+            query = self._translate(_EXPLAIN.sub('', sql, count=1))
+            return _Plan('explain', query.sql, text=query.kind)
+
+        sql = _LOCKING.sub('', sql, count=1)
+        m = _CREATE_TABLE.match(sql)
+        if m:
+            return self._create_table(sql, m)
+
+        m = _CREATE_VIEW.match(sql)
+        if m:
+            name = self._name(m.group(2))
+            stmts = ['DROP VIEW IF EXISTS "{}"'.format(name)] if m.group(1).upper() == 'REPLACE' \
+                    else []
+            stmts.append('CREATE VIEW "{}" {} AS {}'.format(
+                            name, m.group(3) or '', self._expressions(m.group(4))))
+            return _Plan('ddl', stmts, [('sync', (name, sql))])
+
+        m = _TD_CREATE_INDEX.match(sql)
+        if m:
+            unique, idx, cols, table = m.groups()
+            table = self._name(table)
+            idx = _unquote(idx) if idx else '_td_index_{}_{}'.format(
+                        table, re.sub(r'\W', '_', cols))
+            return _Plan('ddl', ['CREATE {}INDEX "{}" ON "{}" ({})'.format(
+                            unique or '', idx, table, cols)], [('sync', (table, None))])
+        m = _CREATE_INDEX.match(sql)
+        if m:
+            unique, idx, table, cols = m.groups()
+            table = self._name(table)
+            return _Plan('ddl', ['CREATE {}INDEX "{}" ON "{}" ({})'.format(
+                            unique or '', self._name(idx), table, cols)], [('sync', (table, None))])
+
+        m = _DROP.match(sql)
+        if m:
+            name = self._name(m.group(2))
+            return _Plan('ddl', ['DROP {} "{}"'.format(m.group(1).upper(), name)],
+                         [('sync', (name, None))])
+
+        m = _DROP_INDEX.match(sql)
+        if m:
+            return _Plan('ddl', ['DROP INDEX "{}"'.format(self._name(m.group(1)))],
+                         [('sync_index', (self._name(m.group(1)),))])
+
+        m = _RENAME.match(sql)
+        if m:
+            old, new = self._name(m.group(1)), self._name(m.group(2))
+            return _Plan('ddl', ['ALTER TABLE "{}" RENAME TO "{}"'.format(old, new)],
+                         [('rename', (old, new)), ('sync', (old, None)), ('sync', (new, None))])
+
+        m = _ALTER.match(sql)
+        if m:
+            return self._alter_table(self._name(m.group(1)), m.group(2))
+
+        return _Plan('query', [self._expressions(s) for s in [sql]])
+
+    def _create_table(self, sql, m):
+        kinds, name = m.group(1).upper(), self._name(m.group(2))
+        start = sql.index('(', m.end())
+        end = _closing(sql, start + 1)
+        post = sql[end + 1:]
+
+        attrs, defs = [], []
+        for element in _split(sql[start + 1:end], ','):
+            if not element.strip():
+                continue
+            if _TABLE_CONSTRAINTS.match(element):
+                defs.append(element.strip())
+            else:
+                defs.append(_column_def(element.strip(), attrs))
+
+        temp = 'VOLATILE' in kinds or 'TEMPORARY' in kinds
+        stmt = 'CREATE {}TABLE "{}" (\n\t{}\n)'.format('TEMP ' if temp else '', name,
+                                                       ', \n\t'.join(defs))
+        if temp:
+            return _Plan('ddl', [stmt])
+
+        pi = _PRIMARY_INDEX.search(post)
+        if pi:
+            index = ('Q' if _PARTITION.search(post) else 'P', 'Y' if pi.group(1) else 'N',
+                     _unquote(pi.group(2)) if pi.group(2) else None,
+                     ','.join(_unquote(c) for c in pi.group(3).split(',')))
+        elif _NO_PRIMARY_INDEX.search(post):
+            index = ('N', None, None, None)
+        else:
+            index = None
+
+        stmts = [stmt]
+        for unique, idx, cols in _SECONDARY_INDEX.findall(_PRIMARY_INDEX.sub('', post)):
+            idx = _unquote(idx) if idx else '_td_index_{}_{}'.format(name, re.sub(r'\W', '_', cols))
+            stmts.append('CREATE {}INDEX "{}" ON "{}" ({})'.format(unique, idx, name, cols))
+
+        return _Plan('ddl', stmts, [('create', (name, index, attrs)), ('sync', (name, sql))])
+
+    def _alter_table(self, name, action):
+        attrs, stmts = [], []
+        for element in _split(action, ','):
+            words = element.split(None, 1)
+            verb = words[0].upper()
+            if verb == 'ADD' and not _TABLE_CONSTRAINTS.match(words[1]):
+                rest = re.sub(r'^\s*COLUMN\s+', '', words[1], flags=re.I)
+                stmts.append('ALTER TABLE "{}" ADD COLUMN {}'.format(
+                                name, _column_def(rest.strip(), attrs)))
+            elif verb == 'DROP' and not _TABLE_CONSTRAINTS.match(words[1]):
+                col = re.sub(r'^\s*COLUMN\s+', '', words[1], flags=re.I)
+                stmts.append('ALTER TABLE "{}" DROP COLUMN {}'.format(name, col.strip()))
+            elif verb == 'RENAME':
+                stmts.append('ALTER TABLE "{}" RENAME {}'.format(name, words[1]))
+            # table options (FALLBACK, ...) have no SQLite equivalent
+        return _Plan('ddl', stmts, [('attrs', (name, attrs)), ('sync', (name, None))])
+
+    #
+    # the data dictionary
+    #
+
+    def _apply(self, action, args):
+        c = self._conn
+        if action == 'create':
+            name, index, attrs = args
+            c.execute('DELETE FROM dbc._PrimaryIndexes WHERE TableName = ?', (name,))
+            if index is not None:
+                c.execute('INSERT INTO dbc._PrimaryIndexes VALUES (?, ?, ?, ?, ?)',
+                          (name,) + index)
+            c.execute('DELETE FROM dbc._ColumnAttrs WHERE TableName = ?', (name,))
+            self._apply('attrs', (name, attrs))
+        elif action == 'attrs':
+            name, attrs = args
+            for a in attrs:
+                if len(a) > 1:
+                    c.execute('INSERT INTO dbc._ColumnAttrs VALUES (?, ?, ?, ?, ?)',
+                              (name, a['name'], a.get('format'), a.get('idcoltype'),
+                               a.get('title')))
+        elif action == 'rename':
+            for table in ('_PrimaryIndexes', '_ColumnAttrs'):
+                c.execute('UPDATE dbc.{} SET TableName = ? WHERE TableName = ?'.format(table),
+                          (args[1], args[0]))
+        elif action == 'sync_index':
+            # run before the index is dropped
+            row = c.execute("SELECT tbl_name FROM main.sqlite_master WHERE type = 'index' "
+                            "AND name = ?", args).fetchone()
+            return row and row[0]
+        elif action == 'sync':
+            self._sync(*args)
+
+    def _sync(self, name, request_text=None):
+        """
+        Refreshes the dictionary rows of a table or view from SQLite.
+        """
+        c, db = self._conn, self.database
+        old = c.execute('SELECT CreateTimeStamp, RequestText FROM dbc.TablesV '
+                        'WHERE DatabaseName = ? AND TableName = ?', (db, name)).fetchone()
+        for table, col in (('TablesV', 'TableName'), ('ColumnsQV', 'TableName'),
+                           ('Indices', 'TableName'), ('All_RI_ChildrenV', 'ChildTable')):
+            c.execute('DELETE FROM dbc.{} WHERE {} = ? AND {} = ?'.format(
+                        table, 'ChildDB' if table == 'All_RI_ChildrenV' else 'DatabaseName', col),
+                      (db, name))
+
+        obj = c.execute("SELECT type, name FROM main.sqlite_master WHERE type IN "
+                        "('table', 'view') AND name = ? COLLATE NOCASE", (name,)).fetchone()
+        if obj is None:
+            c.execute('DELETE FROM dbc._PrimaryIndexes WHERE TableName = ?', (name,))
+            c.execute('DELETE FROM dbc._ColumnAttrs WHERE TableName = ?', (name,))
+            return
+        kind, name = 'V' if obj[0] == 'view' else 'T', obj[1]
+        now = _timestamp()
+        c.execute('INSERT INTO dbc.TablesV VALUES (?, ?, ?, ?, ?, ?, NULL)',
+                  (db, name, kind, old[0] if old else now, now,
+                   request_text or (old[1] if old else None)))
+
+        attrs = dict((r[0].lower(), r[1:]) for r in c.execute(
+                        'SELECT ColumnName, ColumnFormat, IdColType, ColumnTitle '
+                        'FROM dbc._ColumnAttrs WHERE TableName = ?', (name,)))
+        columns = c.execute('PRAGMA main.table_info("{}")'.format(name)).fetchall()
+        positions = {}
+        for cid, cname, decltype, notnull, default, pk in columns:
+            code, length, charset, digits, scale, fmt = _decode_type(decltype)
+            fmt_, idcol, title = attrs.get(cname.lower(), (None, None, None))
+            positions[cname.lower()] = cid + 1
+            c.execute('INSERT INTO dbc.ColumnsQV VALUES '
+                      '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?)',
+                      (db, name, cname, cid + 1, code, length, charset, digits, scale,
+                       fmt_ or fmt, 'N' if notnull or pk else 'Y', default, idcol, title, kind))
+        if kind == 'V':
+            return
+
+        indexes = []
+        pk = [r[1] for r in sorted(columns, key=lambda r: r[5]) if r[5]]
+        pi = c.execute('SELECT IndexType, UniqueFlag, IndexName, ColumnNames FROM '
+                       'dbc._PrimaryIndexes WHERE TableName = ?', (name,)).fetchone()
+        if pi is None:
+            # without a primary index clause the primary key, or else the
+            # first column, is the primary index
+            indexes.append(('K', 'Y', None, pk) if pk else ('P', 'N', None, [columns[0][1]]))
+        else:
+            if pi[0] != 'N':
+                indexes.append((pi[0], pi[1], pi[2], pi[3].split(',')))
+            if pk:
+                indexes.append(('K', 'Y', None, pk))
+
+        for seq, idx, unique, origin, partial in c.execute(
+                        'PRAGMA main.index_list("{}")'.format(name)).fetchall()[::-1]:
+            if origin == 'pk':
+                continue
+            cols = [r[2] for r in c.execute('PRAGMA main.index_info("{}")'.format(idx))]
+            if origin == 'u':
+                indexes.append(('U', 'Y', None, cols))
+            else:
+                indexes.append(('S', 'Y' if unique else 'N',
+                                None if idx.startswith('_td_index_') else idx, cols))
+
+        for number, (type_, unique, idx, cols) in enumerate(indexes):
+            for col in cols:
+                c.execute('INSERT INTO dbc.Indices VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                          (db, name, 1 if number == 0 and type_ in ('P', 'Q', 'K') and
+                                           (pi is None or pi[0] != 'N') else 4 * number or 4,
+                           type_, unique, idx, col.strip(), positions.get(col.strip().lower())))
+
+        for fk in c.execute('PRAGMA main.foreign_key_list("{}")'.format(name)).fetchall():
+            fk_id, seq, parent, child_col, parent_col = fk[:5]
+            c.execute('INSERT INTO dbc.All_RI_ChildrenV VALUES (?, NULL, ?, ?, ?, ?, ?, ?)',
+                      (fk_id, db, name, child_col, db, parent, parent_col))
+
+    def _explain(self, sql, params):
+        try:
+            rows = self._conn.execute('SELECT count(*) FROM ({})'.format(sql), params).fetchone()[0]
+        except sqlite3.Error:
+            rows = 1
+        return [(line,) for line in (
+            '  1) First, we do an all-AMPs RETRIEVE step by way of an all-rows scan',
+            '     with no residual conditions into Spool 1 (group_amps), which is',
+            '     built locally on the AMPs.  The size of Spool 1 is estimated with',
+            '     high confidence to be {:,} rows ({:,} bytes).  The estimated time for'.format(
+                rows, rows * 100),
+            '     this step is 0.01 seconds.',
+            '  -> The contents of Spool 1 are sent back to the user as the result of',
+            '     statement 1.  The total estimated time is 0.01 seconds.')]
+
+
+class Cursor(object):
+
+    arraysize = 1
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self._results = []
+        self._rows = []
+        self._pos = 0
+        self._received = 0
+
+    def _statements(self, operation, params):
+        """
+        Pairs the statements of a request with their parameters.
+        """
+        stmts = [s for s in _split(operation, ';') if s.strip()]
+        if len(stmts) == 1:
+            return [(stmts[0], params)]
+        res, pos = [], 0
+        for stmt in stmts:
+            n = _count_params(stmt)
+            res.append((stmt, params[pos:pos + n]))
+            pos += n
+        return res
+
+    def _run(self, plan, params, many=False):
+        conn = self.connection
+        sqlite = conn._conn
+        if plan.kind == 'noop':
+            return (None, [], -1)
+        if plan.kind == 'explain':
+            return ([('Explanation', None, None, None, None, None, None)],
+                    conn._explain(plan.sql[0], params), 7)
+        if plan.kind == 'ddl':
+            tables = [conn._apply(a, args) for a, args in plan.actions
+                      if a == 'sync_index']
+            for sql in plan.sql:
+                sqlite.execute(sql)
+            for action, args in plan.actions:
+                conn._apply(action, args)
+            for table in tables:
+                if table:
+                    conn._sync(table)
+            return (None, [], -1)
+
+        cursor = sqlite.cursor()
+        if many:
+            cursor.executemany(plan.sql[0], [_adapt(p) for p in params])
+        else:
+            cursor.execute(plan.sql[0], _adapt(params))
+        if cursor.description is None:
+            return (None, [], cursor.rowcount)
+        # the activity count of a query is its number of rows
+        rows = cursor.fetchall()
+        return ([(d[0],) + (None,) * 6 for d in cursor.description], rows, len(rows))
+
+    def execute(self, operation, params=None, **kwargs):
+        conn = self.connection
+        params = list(params or ())
+        start = time.time()
+        conn._count(requests=1, round_trips=1,
+                    prepares=1 if params else 0,
+                    bytes_sent=_size(operation) + _row_size(params),
+                    statements=[operation])
+        self._results = []
+        try:
+            for stmt, args in self._statements(operation, params):
+                self._results.append(self._run(conn._translate(stmt), args))
+        finally:
+            conn._count(elapsed=time.time() - start)
+        self.nextset()
+        return self
+
+    def executemany(self, operation, seq_of_parameters, batch=None, **kwargs):
+        conn = self.connection
+        rows = [list(p) for p in seq_of_parameters]
+        start = time.time()
+        # tdodbc without batch=True sends a request per parameter row,
+        # teradatasql a single request
+        trips = 1 if batch or conn.batches else len(rows)
+        conn._count(requests=trips, round_trips=trips,
+                    prepares=1 if rows else 0,
+                    bytes_sent=_size(operation) * trips + sum(_row_size(r) for r in rows),
+                    statements=[operation])
+        try:
+            self._results = [self._run(conn._translate(operation), rows, many=True)]
+        finally:
+            conn._count(elapsed=time.time() - start)
+        self.nextset()
+        return self
+
+    def nextset(self):
+        if not self._results:
+            return None
+        self.description, self._rows, self.rowcount = self._results.pop(0)
+        self._pos = 0
+        self._received = 0
+        return True
+
+    def _fetch(self, size):
+        start = time.time()
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        nbytes = sum(_row_size(r) for r in rows)
+        # a round trip for every response buffer filled
+        buffers = (self._received + nbytes) // response_buffer_size - \
+                        self._received // response_buffer_size
+        self._received += nbytes
+        self.connection._count(round_trips=buffers, bytes_received=nbytes,
+                               elapsed=time.time() - start)
+        return rows
+
+    def fetchone(self):
+        rows = self._fetch(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=None):
+        return self._fetch(size or self.arraysize)
+
+    def fetchall(self):
+        return self._fetch(len(self._rows))
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def setinputsizes(self, *sizes):
+        pass
+
+    def close(self):
+        self._results = []
+        self._rows = []
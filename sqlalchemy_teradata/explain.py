@@ -0,0 +1,231 @@
+# sqlalchemy_teradata/explain.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+import re
+from sqlalchemy import exc, util
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+_STEP = re.compile(r'^(\s*)(\d+)\)\s+(.*)$')
+_NUMBER = r'\d[\d,]*(?:\.\d+)?(?:[eE][+-]?\d+)?'
+_ROWS = re.compile(r'estimated with [\w\s]*?confidence to be\s+'
+                   r'(' + _NUMBER + r')(?:\s+to\s+(' + _NUMBER + r'))?\s+rows?',
+                   re.I)
+_DURATION = r'(?:' + _NUMBER + r'\s+(?:hours?|minutes?|seconds?)(?:,?\s*and\s+|,\s*)?)+'
+_STEP_TIME = re.compile(r'estimated time for this step is\s+(' + _DURATION + ')', re.I)
+_TOTAL_TIME = re.compile(r'total estimated time is\s+(' + _DURATION + ')', re.I)
+_UNIT = re.compile(r'(' + _NUMBER + r')\s+(hour|minute|second)s?', re.I)
+_SECONDS = {'hour': 3600.0, 'minute': 60.0, 'second': 1.0}
+
+
+def _number(s):
+    return float(s.replace(',', ''))
+
+def _duration(s):
+    return sum(_number(n) * _SECONDS[unit.lower()] for n, unit in _UNIT.findall(s))
+
+
+class Explain(Executable, ClauseElement):
+    """
+    An EXPLAIN request for a statement.
+
+    ex.
+    from sqlalchemy_teradata.explain import Explain
+    conn.execute(Explain(select([t1]).where(t1.c.c1 == 5)))
+
+    The result rows hold the explanation text, one line per row.
+    """
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain)
+def visit_explain(element, compiler, **kw):
+    return 'EXPLAIN ' + compiler.process(element.statement, **kw)
+
+
+class ExplainStep(object):
+    """
+    A single numbered step of an explanation along with the estimates
+    and plan flags found in its text. steps are the indented steps under
+    it, e.g. those of "We execute the following steps in parallel."; a
+    step without a time estimate of its own takes the longest of theirs.
+    """
+
+    def __init__(self, number, text, steps=()):
+        self.number = number
+        self.text = text
+        self.steps = list(steps)
+
+        rows = _ROWS.findall(text)
+        self.estimated_rows = max(_number(hi or lo) for lo, hi in rows) if rows else None
+
+        time = _STEP_TIME.search(text)
+        self.estimated_time = _duration(time.group(1)) if time else None
+        if self.estimated_time is None:
+            times = [s.estimated_time for s in self.steps if s.estimated_time is not None]
+            self.estimated_time = max(times) if times else None
+
+        lowered = text.lower()
+        self.product_join = 'product join' in lowered
+        self.full_scan = 'all-rows scan' in lowered
+        self.redistribution = 'redistributed by' in lowered or\
+                              'duplicated on all amps' in lowered
+
+    def __repr__(self):
+        return 'ExplainStep(%d, rows=%r, time=%r)' % (self.number,
+                                                      self.estimated_rows,
+                                                      self.estimated_time)
+
+
+class ExplainPlan(object):
+    """
+    The structured form of the text returned by EXPLAIN.
+
+    steps are the top level steps, with their indented steps nested in them.
+    estimated_rows is the row estimate of the last step that has one
+    (the spool returned to the user), largest_rows the largest estimate of
+    any step and estimated_time the total estimated time in seconds. The
+    product_join, full_scan and redistribution flags are True if any step
+    has them.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+        # [indent, number, lines, sub-steps] of the steps found, the
+        # enclosing ones in parents
+        top, parents, step = [], [], None
+        for line in text.splitlines():
+            match = _STEP.match(line)
+            if match:
+                indent = len(match.group(1).expandtabs())
+                while parents and parents[-1][0] >= indent:
+                    parents.pop()
+                step = [indent, int(match.group(2)), [match.group(3).strip()], []]
+                (parents[-1][3] if parents else top).append(step)
+                parents.append(step)
+            elif step is not None and line.strip():
+                step[2].append(line.strip())
+
+        def build(step):
+            return ExplainStep(step[1], ' '.join(step[2]), [build(s) for s in step[3]])
+        self.steps = [build(s) for s in top]
+
+        rows = [s.estimated_rows for s in self.all_steps() if s.estimated_rows is not None]
+        self.estimated_rows = rows[-1] if rows else None
+        self.largest_rows = max(rows) if rows else None
+
+        total = _TOTAL_TIME.search(' '.join(text.split()))
+        if total:
+            self.estimated_time = _duration(total.group(1))
+        else:
+            times = [s.estimated_time for s in self.steps if s.estimated_time is not None]
+            self.estimated_time = sum(times) if times else None
+
+    def all_steps(self):
+        """
+        The steps and their nested steps, in the order of the text.
+        """
+        def walk(steps):
+            for s in steps:
+                yield s
+                for sub in walk(s.steps):
+                    yield sub
+        return list(walk(self.steps))
+
+    @property
+    def product_join(self):
+        return any(s.product_join for s in self.all_steps())
+
+    @property
+    def full_scan(self):
+        return any(s.full_scan for s in self.all_steps())
+
+    @property
+    def redistribution(self):
+        return any(s.redistribution for s in self.all_steps())
+
+    def __repr__(self):
+        return 'ExplainPlan(steps=%d, rows=%r, time=%r)' % (len(self.steps),
+                                                           self.estimated_rows,
+                                                           self.estimated_time)
+
+
+class ExplainGuardError(exc.SQLAlchemyError):
+    """
+    Raised when the teradata_explain_guard execution option refuses a statement.
+    The offending plan is available as the plan attribute.
+    """
+
+    def __init__(self, message, plan):
+        super(ExplainGuardError, self).__init__(message)
+        self.plan = plan
+
+
+def parse_explain(rows):
+    """
+    Builds an ExplainPlan from the rows (or the text) returned by EXPLAIN.
+    """
+    if isinstance(rows, util.string_types):
+        return ExplainPlan(rows)
+    return ExplainPlan('\n'.join(row[0] for row in rows if row[0] is not None))
+
+
+def explain(connection, statement, *multiparams, **params):
+    """
+    Runs EXPLAIN for statement on connection and returns the ExplainPlan.
+
+    statement is compiled through the connection's dialect so the explained
+    text is the one that would be sent by connection.execute(statement).
+    """
+    res = connection.execute(Explain(statement), *multiparams, **params)
+    return parse_explain(res.fetchall())
+
+
+def check_plan(plan, guard):
+    """
+    Checks plan against the limits of a teradata_explain_guard dict and
+    returns a message describing the first violation, or None.
+
+    The dict keys are:
+        max_rows: the largest accepted row estimate, of any step: the
+                  spools along the way as well as the result
+        max_time: the largest accepted total time estimate in seconds
+        allow_product_join: if False, plans with a product join are refused
+    """
+    max_rows = guard.get('max_rows')
+    if max_rows is not None and plan.largest_rows is not None and\
+                    plan.largest_rows > max_rows:
+        return 'estimated rows %d exceed the limit of %d' % (plan.largest_rows, max_rows)
+
+    max_time = guard.get('max_time')
+    if max_time is not None and plan.estimated_time is not None and\
+                    plan.estimated_time > max_time:
+        return 'estimated time %.2fs exceeds the limit of %.2fs' % (plan.estimated_time, max_time)
+
+    if not guard.get('allow_product_join', True) and plan.product_join:
+        return 'the plan contains a product join'
+    return None
+
+
+def guard_statement(cursor, statement, parameters, guard):
+    """
+    Explains statement on the DBAPI cursor and raises ExplainGuardError
+    if the plan violates guard. Called by the execution context.
+    """
+    if parameters:
+        cursor.execute('EXPLAIN ' + statement, parameters)
+    else:
+        cursor.execute('EXPLAIN ' + statement)
+    plan = parse_explain(cursor.fetchall())
+
+    violation = check_plan(plan, guard)
+    if violation is not None:
+        raise ExplainGuardError('Statement refused by teradata_explain_guard: ' +
+                                violation, plan)
+    return plan
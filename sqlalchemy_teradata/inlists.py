@@ -0,0 +1,170 @@
+# sqlalchemy_teradata/inlists.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Large IN lists loaded into volatile tables.
+
+col.in_(ids) with 50,000 ids sends a request of 50,000 parameters, which
+runs into the request size limits of Teradata and is slow to parse. With
+in_list_threshold, the dialect loads the values of the IN lists longer than
+the threshold into volatile tables of the session, with one batched INSERT
+each, and the predicates select from them instead:
+
+    engine = create_engine('teradata://...', in_list_threshold=1000)
+    session.query(Order).filter(Order.id.in_(ids))
+
+    SELECT ... FROM orders WHERE orders.id IN (SELECT v FROM td_in_list_1)
+
+The predicate keeps the meaning of the list, NOT IN and NULLs included,
+and the request has the same size whatever the number of values. There is
+a table for each column type and for each list of that type in a
+statement, emptied before each load.
+
+The tables are DDL, which must not run in the middle of a transaction: a
+connection creates the table of a type the first time it needs it outside
+a transaction, and a list that needs a table it does not have yet inside a
+transaction raises an InvalidRequestError. The tables of the types given
+in in_list_types are created on every new connection instead:
+
+    engine = create_engine('teradata://...', in_list_threshold=1000,
+                           in_list_types=[Integer(), String(20)])
+
+Lists of tuples, lists of values of no known type and executemany() are
+sent as they are.
+"""
+
+from sqlalchemy import exc, util
+from sqlalchemy.sql import operators, sqltypes
+from sqlalchemy.sql.expression import BindParameter, bindparam
+
+IN_OPERATORS = (operators.in_op, operators.notin_op)
+
+TABLE_PREFIX = 'td_in_list_'
+
+
+class InListTable(object):
+    """
+    Stands for the values of an expanding IN parameter once they are
+    loaded into the volatile table name.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.select = 'SELECT v FROM %s' % name
+
+
+def expanding_in(binary, threshold):
+    """
+    binary, an IN of more than threshold bound values, as an IN of a
+    single expanding parameter of the values, or None for other binaries.
+
+    SQLAlchemy 1.4 binds the lists of in_() as expanding parameters
+    already; those of SQLAlchemy 1.3 are a parameter per value.
+    """
+    clauses = getattr(getattr(binary.right, 'element', None), 'clauses', None)
+    if not clauses or len(clauses) <= threshold:
+        return None
+    for clause in clauses:
+        if not isinstance(clause, BindParameter) or clause.expanding:
+            return None
+    values = bindparam(None, [c.effective_value for c in clauses],
+                       type_=clauses[0].type, expanding=True)
+    return binary.operator(binary.left, values)
+
+
+def _values(type_, values):
+    # a string longer than the column never equals its values, and is left
+    # out; the trailing blanks do not count in comparisons
+    length = getattr(type_, 'length', None)
+    if not isinstance(type_, sqltypes.String) or length is None:
+        return values
+    values = [v.rstrip(' ') if isinstance(v, util.string_types) and len(v) > length else v
+              for v in values]
+    return [v for v in values if not isinstance(v, util.string_types) or len(v) <= length]
+
+
+def _create_table(dbapi_connection, tables, column_type, number):
+    name = TABLE_PREFIX + str(len(tables) + 1)
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('CREATE MULTISET VOLATILE TABLE %s (v %s) PRIMARY INDEX (v) '
+                       'ON COMMIT PRESERVE ROWS' % (name, column_type))
+    finally:
+        cursor.close()
+    # the DDL is alone in its transaction
+    dbapi_connection.commit()
+    tables[(column_type, number)] = name
+    return name
+
+
+def create_tables(dialect, dbapi_connection, types):
+    """
+    Creates the volatile tables of the IN lists of the types on a new DBAPI
+    connection.
+    """
+    tables = dialect._in_list_tables(dbapi_connection)
+    for type_ in types:
+        column_type = dialect._type_ddl(type_)
+        if column_type is None:
+            raise exc.ArgumentError('IN lists of %r cannot be loaded into a '
+                                    'volatile table' % type_)
+        if (column_type, 1) not in tables:
+            _create_table(dbapi_connection, tables, column_type, 1)
+
+
+def load_in_lists(context):
+    """
+    Loads the values of the expanding IN parameters of the execution
+    context longer than the in_list_threshold of its dialect into volatile
+    tables, and puts InListTables in their place in its parameters.
+    """
+    dialect = context.dialect
+    compiled = context.compiled
+    if compiled is None or context.executemany or context.isddl or\
+                    not getattr(compiled, 'binds', None):
+        return
+    params = context.compiled_parameters[0]
+    processors = compiled._bind_processors
+    numbers = {}
+    cursor = None
+    try:
+        for name, bind in compiled.binds.items():
+            values = params.get(name)
+            if not bind.expanding or not isinstance(values, (list, tuple)) or\
+                            len(values) <= dialect.in_list_threshold or\
+                            isinstance(values[0], (list, tuple)):
+                continue
+            column_type = dialect._type_ddl(bind.type)
+            if column_type is None:
+                continue
+            number = numbers[column_type] = numbers.get(column_type, 0) + 1
+            tables = dialect._in_list_tables(context._dbapi_connection)
+            table = tables.get((column_type, number))
+            if table is None:
+                if context.root_connection.in_transaction():
+                    raise exc.InvalidRequestError(
+                        'The volatile table for an IN list of %s is created '
+                        'outside of transactions; list the type in the '
+                        'in_list_types of the dialect' % column_type)
+                table = _create_table(context._dbapi_connection, tables,
+                                      column_type, number)
+
+            if cursor is None:
+                cursor = context._dbapi_connection.cursor()
+            process = processors.get(name)
+            rows = [(process(v) if process is not None else v,)
+                    for v in _values(bind.type, values)]
+            cursor.execute('DELETE FROM %s' % table)
+            if rows:
+                # the values are always loaded in a single request, whatever
+                # batch_executemany says for the statements of the user
+                dialect.do_executemany(cursor, 'INSERT INTO %s (v) VALUES (?)' % table,
+                                       rows, batch=True)
+            params[name] = InListTable(table)
+    finally:
+        if cursor is not None:
+            cursor.close()
@@ -0,0 +1,235 @@
+# sqlalchemy_teradata/lob.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Reading and writing BLOB and CLOB values in chunks.
+
+A LOB column fetched with a select is read whole into memory. Instead,
+select_lobs() fetches the other columns of the rows and the sizes of their
+LOBs, and gives each LOB as a LOBReader, a file-like object that reads it
+in chunks of SUBSTR(column, start, chunk_size) when it is read:
+
+    for row in select_lobs(conn, documents, documents.c.kind == 'pdf'):
+        with open(row['name'], 'wb') as f:
+            for chunk in row['content']:
+                f.write(chunk)
+
+insert_lobs() and write_lob() take files for LOB values, and send them in
+chunks: the first chunk with the INSERT or an UPDATE, and the rest appended
+with UPDATE ... SET column = column || chunk:
+
+    with open('report.pdf', 'rb') as f:
+        insert_lobs(conn, documents, {'id': 1, 'name': 'report.pdf', 'content': f})
+
+The chunks of a LOB are written in one transaction, that of the connection
+if one is begun, so that a failed write leaves no partial LOB behind. Each
+appended chunk makes the server rewrite the LOB so far: writing a LOB of n
+chunks copies about n * n / 2 chunks, so give large files a chunk_size that
+keeps their chunks few, e.g. 16 MB for hundreds of MB.
+
+Sizes and positions are in bytes for BLOBs and in characters for CLOBs.
+The rows of a LOBReader are found by their primary key, or the key columns
+given to select_lobs().
+"""
+
+import contextlib
+
+from sqlalchemy import exc, func
+from sqlalchemy.sql import select, and_, bindparam, sqltypes
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def is_lob(type_):
+    return isinstance(type_, (sqltypes.LargeBinary, sqltypes.Text))
+
+
+class LOBReader(object):
+    """
+    A read-only file-like object over the LOB of column in the row of
+    whereclause, of size bytes (or characters of a CLOB), fetched in chunks
+    of chunk_size when it is read.
+    """
+
+    def __init__(self, connection, column, whereclause, size,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        self.connection = connection
+        self.column = column
+        self.whereclause = whereclause
+        self.size = size
+        self.chunk_size = chunk_size
+        self.closed = False
+        self._pos = 0
+        self._empty = u'' if isinstance(column.type, sqltypes.Text) else b''
+
+    def _fetch(self, start, length):
+        # the positions of SUBSTR start at 1
+        stmt = select([func.substr(self.column, start + 1, length,
+                                   type_=self.column.type)]).where(self.whereclause)
+        value = self.connection.execute(stmt).scalar()
+        if value is None:
+            raise exc.InvalidRequestError(
+                "The LOB of column '%s' was changed or removed while reading it" %
+                self.column.name)
+        return value
+
+    def read(self, size=-1):
+        if self.closed:
+            raise ValueError('I/O operation on closed LOBReader')
+        remaining = max(self.size - self._pos, 0)
+        size = remaining if size is None or size < 0 else min(size, remaining)
+
+        chunks = []
+        while size > 0:
+            chunk = self._fetch(self._pos, min(size, self.chunk_size))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self._pos += len(chunk)
+            size -= len(chunk)
+        return self._empty.join(chunks)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self.size
+        if offset < 0:
+            raise ValueError('negative seek position %d' % offset)
+        self._pos = offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        self.closed = True
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return '<LOBReader %s, %d of %d>' % (self.column, self._pos, self.size)
+
+
+def _size(column):
+    if isinstance(column.type, sqltypes.Text):
+        return func.characters(column, type_=sqltypes.Integer)
+    return func.bytes(column, type_=sqltypes.Integer)
+
+
+def _key_clause(key, values):
+    return and_(*[c == values[c] for c in key])
+
+
+def select_lobs(connection, table, whereclause=None, key=None,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    The rows of table matching whereclause, as dicts of the column keys,
+    with a LOBReader for each LOB that is not NULL. The LOBs are not
+    fetched until they are read.
+
+    key are the columns finding the row of a LOB, the primary key of table
+    by default.
+    """
+    key = list(key if key is not None else table.primary_key.columns)
+    if not key:
+        raise exc.ArgumentError(
+            "Table '%s' has no primary key, give the key columns of its rows" % table.name)
+
+    lobs = [c for c in table.columns if is_lob(c.type)]
+    columns = [c for c in table.columns if not is_lob(c.type)]
+    sizes = [_size(c).label(None) for c in lobs]
+    stmt = select(columns + sizes)
+    if whereclause is not None:
+        stmt = stmt.where(whereclause)
+
+    rows = []
+    # the rows are fetched before the LOBs can be read on the connection
+    for row in connection.execute(stmt).fetchall():
+        values = dict((c.key, row[c]) for c in columns)
+        for c, size in zip(lobs, sizes):
+            values[c.key] = None if row[size] is None else LOBReader(
+                connection, c, _key_clause(key, row), row[size], chunk_size)
+        rows.append(values)
+    return rows
+
+
+@contextlib.contextmanager
+def _transaction(connection):
+    """
+    Runs the block in a transaction of connection, unless one is begun.
+    """
+    if connection.in_transaction():
+        yield
+    else:
+        with connection.begin():
+            yield
+
+
+def _append(connection, column, whereclause, fileobj, chunk_size):
+    stmt = column.table.update().where(whereclause).values({
+        column.key: column.concat(bindparam('_lob_chunk', type_=column.type))})
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        connection.execute(stmt, _lob_chunk=chunk)
+
+
+def write_lob(connection, column, whereclause, fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Replaces the LOB of column in the rows of whereclause with the contents
+    of fileobj, read and sent in chunks of chunk_size.
+    """
+    with _transaction(connection):
+        chunk = fileobj.read(chunk_size)
+        connection.execute(column.table.update().where(whereclause).values({column.key: chunk}))
+        _append(connection, column, whereclause, fileobj, chunk_size)
+
+
+def insert_lobs(connection, table, values, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Inserts a row of values into table, where the values of LOB columns
+    can be files, which are read and sent in chunks of chunk_size. The
+    values must include the primary key of the row.
+    """
+    files = dict((k, v) for k, v in values.items() if hasattr(v, 'read'))
+    key = list(table.primary_key.columns)
+    if files and (not key or any(values.get(c.key) is None for c in key)):
+        raise exc.ArgumentError(
+            'The primary key of the row must be given to insert LOBs from files')
+
+    values = dict(values)
+    with _transaction(connection):
+        for k, f in files.items():
+            values[k] = f.read(chunk_size)
+        result = connection.execute(table.insert().values(values))
+
+        whereclause = _key_clause(key, dict((c, values[c.key]) for c in key))
+        for k, f in files.items():
+            _append(connection, table.c[k], whereclause, f, chunk_size)
+    return result
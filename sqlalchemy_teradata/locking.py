@@ -0,0 +1,117 @@
+# sqlalchemy_teradata/locking.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+LOCKING request modifiers for SELECT statements.
+
+The teradata_locking execution option prefixes the SELECTs it applies to
+with a LOCKING modifier. Like the other execution options it can be set on
+the engine, a connection or a statement:
+
+    # dirty reads: do not wait on the write locks of loads in progress
+    conn.execution_options(teradata_locking='access').execute(stmt)
+
+    stmt = select([sales]).execution_options(teradata_locking=(sales, 'access'))
+
+A mode ('access', 'read', 'write' or 'exclusive') gives LOCKING ROW FOR
+<mode>, which Teradata escalates to a table lock when the SELECT does not
+access rows by their primary index. A (table, mode) pair gives LOCKING TABLE
+<table> FOR <mode>, where table is a Table or a table name, and a list of
+those gives one modifier for each. The SELECTs with common table
+expressions (WITH ... SELECT) are locked too, statements other than
+SELECT are left alone.
+
+The dialect reads the data dictionary with LOCKING ROW FOR ACCESS, unless
+created with dictionary_locking=False.
+"""
+
+import re
+
+from sqlalchemy import exc, util
+
+SELECT_REGEXP = re.compile(r'\s*SEL(?:ECT)?\b', re.I | re.UNICODE)
+WITH_REGEXP = re.compile(r'\s*WITH(?:\s+RECURSIVE)?\b', re.I | re.UNICODE)
+
+# the parentheses, commas and words of a statement, past its literals,
+# quoted names and comments
+_TOKENS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/|([(),]|\w+)",
+                     re.S | re.UNICODE)
+
+LOCKING_MODES = ('access', 'read', 'write', 'exclusive')
+
+
+def _mode(mode):
+    if not isinstance(mode, util.string_types) or mode.lower() not in LOCKING_MODES:
+        raise exc.ArgumentError(
+            "LOCKING mode must be one of %s, got %r" % (', '.join(LOCKING_MODES), mode))
+    return mode.upper()
+
+
+def format_locking(locking, preparer):
+    """
+    Returns the LOCKING modifiers for the value of the teradata_locking
+    option, or None. Tables are quoted with preparer.
+    """
+    if not locking:
+        return None
+    if isinstance(locking, (util.string_types, tuple)):
+        locking = [locking]
+
+    modifiers = []
+    for lock in locking:
+        if isinstance(lock, util.string_types):
+            modifiers.append('LOCKING ROW FOR %s' % _mode(lock))
+            continue
+        try:
+            obj, mode = lock
+        except (TypeError, ValueError):
+            raise exc.ArgumentError(
+                "teradata_locking takes a mode, a (table, mode) pair or a list "
+                "of those, got %r" % (lock,))
+        if not isinstance(obj, util.string_types):
+            obj = preparer.format_table(obj)
+        modifiers.append('LOCKING TABLE %s FOR %s' % (obj, _mode(mode)))
+    return '\n'.join(modifiers)
+
+
+def is_select(statement):
+    """
+    Whether statement is a SELECT, with common table expressions or not.
+    """
+    if SELECT_REGEXP.match(statement):
+        return True
+    m = WITH_REGEXP.match(statement)
+    if m is None:
+        return False
+
+    # WITH name [(columns)] AS (query) [, ...] is followed by the statement
+    depth, closed = 0, False
+    for token in _TOKENS.finditer(statement, m.end()):
+        token = token.group(1)
+        if token is None:
+            continue
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            closed = depth == 0
+        elif depth == 0:
+            if closed and token != ',' and token.upper() != 'AS':
+                return SELECT_REGEXP.match(token) is not None
+            closed = False
+    return False
+
+
+def lock_select(statement, locking, preparer):
+    """
+    Prefixes statement with the LOCKING modifiers of locking if it
+    is a SELECT.
+    """
+    modifiers = format_locking(locking, preparer)
+    if modifiers is None or not is_select(statement):
+        return statement
+    return modifiers + '\n' + statement
@@ -0,0 +1,401 @@
+# sqlalchemy_teradata/parallel.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Running work on several sessions at once.
+
+parallel_read() splits an extract into disjoint slices and reads them on
+separate pooled sessions, so that a full table extract is not limited by
+what a single session can fetch:
+
+    from sqlalchemy_teradata.parallel import parallel_read
+
+    for rows in parallel_read(engine, orders, partitions=8):
+        process(rows)
+
+The rows are sliced by HASHBUCKET(HASHROW(key)) MOD partitions, with the
+primary index of the table as the default key, or by ranges of a key
+column when bounds are given.
+
+reflect() is MetaData.reflect() with the dictionary queries of the tables
+spread over several sessions:
+
+    from sqlalchemy_teradata.parallel import reflect
+
+    reflect(meta, engine, sessions=8)
+
+execute_concurrently() runs independent statements, such as the queries
+of a dashboard page, on several sessions and returns their results in
+order:
+
+    from sqlalchemy_teradata.parallel import execute_concurrently
+
+    totals, top10, trend = execute_concurrently(
+                    engine, [totals_query, top10_query, trend_query],
+                    max_workers=3, timeout=30)
+"""
+
+import threading
+import time
+
+from sqlalchemy import event, exc, func, inspect, or_, pool, util
+from sqlalchemy.sql import select
+from sqlalchemy.sql.expression import Select
+from sqlalchemy.schema import Table
+from sqlalchemy.util import queue
+from sqlalchemy_teradata.base import cancel_statement
+from sqlalchemy_teradata.dialect import REFLECTED_KEY
+from sqlalchemy_teradata.snapshot import METHODS
+
+
+def _base_table(selectable):
+    if isinstance(selectable, Table):
+        return selectable
+    tables = [f for f in selectable.froms if isinstance(f, Table)]
+    if len(tables) != 1:
+        raise exc.ArgumentError(
+            'A key is required to slice a query over several tables')
+    return tables[0]
+
+
+def _primary_index(bind, table):
+    """
+    Returns the names of the primary index columns of table, as reflected
+    by get_pk_constraint() or else get_indexes().
+    """
+    insp = inspect(bind)
+    pk = insp.get_pk_constraint(table.name, table.schema)['constrained_columns']
+    if pk:
+        return pk
+
+    # indexes come in IndexNumber order, 1 being the PI
+    indexes = insp.get_indexes(table.name, table.schema)
+    if indexes:
+        return indexes[0]['column_names']
+
+    raise exc.ArgumentError(
+        'No primary index found for table {}; give a key'.format(table.name))
+
+
+def _check_pool(engine, partitions):
+    p = engine.pool
+    if isinstance(p, pool.SingletonThreadPool) and p.size <= partitions:
+        # the pool would close the sessions of the other slices
+        raise exc.ArgumentError(
+            'pool_size must be greater than the number of partitions ({})'.format(
+                partitions))
+    if isinstance(p, pool.QueuePool) and p._max_overflow >= 0 and\
+                    p.size() + p._max_overflow < partitions:
+        raise exc.ArgumentError(
+            'The pool cannot check out {} sessions at once'.format(partitions))
+
+
+def slices(engine, selectable, partitions=4, key=None, bounds=None):
+    """
+    Returns the list of disjoint selects reading selectable together.
+
+    key is a column or column name, or a list of them, defaulting to the
+    primary index of the table read. Without bounds the rows are sliced by
+    hash of key into partitions slices; with a sorted list of bounds they
+    are sliced by ranges of the single key column, giving len(bounds) + 1
+    slices.
+    """
+    if key is None:
+        key = _primary_index(engine, _base_table(selectable))
+    elif not isinstance(key, (list, tuple)):
+        key = [key]
+
+    if isinstance(selectable, Select):
+        selectable = selectable.alias('slice')
+    source = selectable
+    cols = [source.c[k] if isinstance(k, util.string_types) else source.c[k.name]
+            for k in key]
+    stmt = select([source])
+
+    if bounds is not None:
+        if len(cols) != 1:
+            raise exc.ArgumentError('Range slicing takes a single key column')
+        col, bounds = cols[0], list(bounds)
+        conds = [or_(col < bounds[0], col.is_(None))]
+        conds += [(col >= lo) & (col < hi) for lo, hi in zip(bounds, bounds[1:])]
+        conds.append(col >= bounds[-1])
+    else:
+        bucket = func.hashbucket(func.hashrow(*cols)).op('MOD')(partitions)
+        conds = [bucket == i for i in range(partitions)]
+
+    return [stmt.where(cond) for cond in conds]
+
+
+_done = object()
+
+
+def parallel_read(engine, selectable, partitions=4, key=None, bounds=None,
+                  batch_size=1000):
+    """
+    Reads selectable (a Table or select) on one pooled session per slice
+    (see slices()) and yields lists of at most batch_size rows as they
+    arrive from the slices. The order of the rows is not defined.
+
+    An error in a slice is raised from the generator; closing the generator
+    early stops the other slices, cancelling their running statements.
+    """
+    stmts = slices(engine, selectable, partitions, key, bounds)
+    _check_pool(engine, len(stmts))
+
+    batches = queue.Queue(maxsize=2 * len(stmts))
+    stop = threading.Event()
+    cursors = {}
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read(i, stmt):
+        def track(conn, cursor, *args):
+            cursors[i] = (cursor, conn.connection.connection)
+
+        try:
+            with engine.connect() as conn:
+                event.listen(conn, 'before_cursor_execute', track)
+                try:
+                    res = conn.execution_options(stream_results=True).execute(stmt)
+                    try:
+                        while True:
+                            rows = res.fetchmany(batch_size)
+                            if not rows or not put(rows):
+                                break
+                    finally:
+                        res.close()
+                finally:
+                    cursors.pop(i, None)
+        except Exception as e:
+            put(e)
+        put(_done)
+
+    threads = [threading.Thread(target=read, args=(i, stmt)) for i, stmt in enumerate(stmts)]
+    for t in threads:
+        t.daemon = True
+        t.start()
+
+    try:
+        running = len(threads)
+        while running:
+            item = batches.get()
+            if item is _done:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        # the slices still reading end once their statement is cancelled,
+        # again if it was only about to start the first time
+        for t in threads:
+            while t.is_alive():
+                for cursor, connection in list(cursors.values()):
+                    cancel_statement(cursor, connection)
+                t.join(0.1)
+
+
+class _Reflected(object):
+    """
+    The reflection results gathered by reflect(), by schema and table name,
+    put in the info_cache of the Inspector reflecting the tables.
+    """
+
+    def __init__(self, entries, default_schema):
+        self.entries = entries
+        self.default_schema = default_schema
+
+    def get(self, method, table_name, schema):
+        entry = self.entries.get((schema, table_name))
+        if entry is None and schema == self.default_schema:
+            entry = self.entries.get((None, table_name))
+        return entry[method] if entry is not None else None
+
+
+def _reflect_table(insp, table, resolve_fks):
+    # reflecttable() is reflect_table() from SQLAlchemy 1.4 on
+    reflect_table = getattr(insp, 'reflect_table', None) or insp.reflecttable
+    try:
+        reflect_table(table, None, resolve_fks=resolve_fks)
+    except Exception:
+        table.metadata.remove(table)
+        raise
+
+
+def reflect(metadata, engine, schema=None, only=None, views=False, sessions=4):
+    """
+    Reflects the tables (and views) of schema into metadata like
+    MetaData.reflect(), running the dictionary queries of the tables
+    (get_columns, get_pk_constraint, get_foreign_keys, get_indexes and
+    get_unique_constraints) on sessions pooled sessions at once. only is a
+    list of table names to reflect. The tables are added to metadata in the
+    order of their names, whatever order the sessions finished in; those
+    already in metadata are left as they are. The tables their foreign keys
+    refer to are reflected too, after them.
+
+    An error in a session stops the others and is raised.
+    """
+    _check_pool(engine, sessions)
+    dialect = engine.dialect
+    insp = inspect(engine)
+    names = insp.get_table_names(schema)
+    if views:
+        names += insp.get_view_names(schema)
+    if only is not None:
+        missing = set(only) - set(names)
+        if missing:
+            raise exc.InvalidRequestError(
+                'Could not reflect: requested table(s) not available in {}: ({})'.format(
+                    schema or dialect.default_schema_name, ', '.join(sorted(missing))))
+        names = [name for name in names if name in only]
+    names = sorted(set(names))
+
+    default_schema = dialect.default_schema_name
+    entries, errors = {}, []
+
+    def run(work):
+        try:
+            with engine.connect() as conn:
+                while not errors:
+                    try:
+                        table_schema, name = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    # a cache per table, so its index rows are read once
+                    info_cache = {}
+                    entry = dict((m, getattr(dialect, m)(conn, name, table_schema,
+                                                         info_cache=info_cache))
+                                 for m in METHODS)
+                    # the tables of the default schema are referred to without
+                    # it, as they are keyed in metadata
+                    for fk in entry['get_foreign_keys']:
+                        if table_schema is None and fk['referred_schema'] == default_schema:
+                            fk['referred_schema'] = None
+                    entries[(table_schema, name)] = entry
+        except Exception as e:
+            errors.append(e)
+
+    def gather(tables):
+        work = queue.Queue()
+        for table in tables:
+            work.put(table)
+        threads = [threading.Thread(target=run, args=(work,))
+                   for i in range(min(sessions, len(tables)))]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+
+    def key(table):
+        return '%s.%s' % table if table[0] else table[1]
+
+    # the tables, then those their foreign keys refer to that are not in
+    # metadata yet, like MetaData.reflect()
+    order = []
+    tables = [(schema, name) for name in names]
+    while tables:
+        gather(tables)
+        order += tables
+        referred = set((fk['referred_schema'], fk['referred_table'])
+                       for table in tables for fk in entries[table]['get_foreign_keys'])
+        tables = sorted((t for t in referred
+                         if t not in entries and key(t) not in metadata.tables),
+                        key=lambda t: (t[0] or '', t[1]))
+
+    # the results reach the dialect through the cache of this Inspector
+    # only, other reflections of the engine run as usual meanwhile; the
+    # referred tables are all reflected, so the foreign keys are resolved
+    # by metadata rather than reflected again
+    insp = inspect(engine)
+    insp.info_cache[REFLECTED_KEY] = _Reflected(entries, default_schema)
+    for table_schema, name in order:
+        if key((table_schema, name)) not in metadata.tables:
+            _reflect_table(insp, Table(name, metadata, schema=table_schema), False)
+
+
+def execute_concurrently(engine, statements, max_workers=4, timeout=None):
+    """
+    Executes statements, each a statement or a (statement, params) pair, on
+    up to max_workers pooled sessions at once, so that running them takes as
+    long as the longest one rather than their sum. Returns, in the order of
+    statements, the list of rows of each statement returning rows and the
+    rowcount of the others.
+
+    The first error stops the other statements and is raised. When timeout
+    seconds pass before all statements are done, the running ones are
+    cancelled and TimeoutError is raised.
+    """
+    items = [s if isinstance(s, tuple) else (s, {}) for s in statements]
+    workers = min(max_workers, len(items))
+    if not workers:
+        return []
+    _check_pool(engine, workers)
+    deadline = time.time() + timeout if timeout is not None else None
+
+    work = queue.Queue()
+    for i, (stmt, params) in enumerate(items):
+        work.put((i, stmt, params))
+    results, errors = [None] * len(items), []
+    running, finished = {}, queue.Queue()
+    stop = threading.Event()
+
+    def run(worker):
+        def track(conn, cursor, *args):
+            running[worker] = (cursor, conn.connection.connection)
+
+        try:
+            with engine.connect() as conn:
+                event.listen(conn, 'before_cursor_execute', track)
+                while not stop.is_set():
+                    try:
+                        i, stmt, params = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        res = conn.execute(stmt, params)
+                        results[i] = res.fetchall() if res.returns_rows else res.rowcount
+                    finally:
+                        running.pop(worker, None)
+        except Exception as e:
+            # statements cancelled after the first error or the deadline
+            # fail too, only the first error is raised
+            if not stop.is_set():
+                errors.append(e)
+                stop.set()
+        finally:
+            finished.put(worker)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(workers)]
+    for t in threads:
+        t.daemon = True
+        t.start()
+
+    try:
+        for t in threads:
+            finished.get(timeout=None if deadline is None else max(deadline - time.time(), 0))
+            if errors:
+                raise errors[0]
+    except queue.Empty:
+        raise exc.TimeoutError(
+            'execute_concurrently did not finish within {} seconds'.format(timeout))
+    finally:
+        stop.set()
+        # the sessions return to the pool once their statement is cancelled
+        for cursor, connection in list(running.values()):
+            cancel_statement(cursor, connection)
+    return results
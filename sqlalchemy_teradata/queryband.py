@@ -0,0 +1,69 @@
+# sqlalchemy_teradata/queryband.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+Query band support for Teradata workload management.
+
+Query bands are given as execution options, which can be set on the engine,
+a connection or a statement:
+
+    engine = create_engine('teradata://...',
+                           execution_options={'teradata_query_band':
+                                              {'App': 'dashboards'}})
+
+    conn.execution_options(teradata_query_band_tags={'Module': 'orders',
+                                                     'RequestId': rid}).\\
+         execute(stmt)
+
+teradata_query_band is the session band (SET QUERY_BAND ... FOR SESSION).
+It is only sent when it differs from the band already set on the pooled
+session, and is cleared again when a statement runs without it.
+
+teradata_query_band_tags are per statement tags (SET QUERY_BAND ... FOR
+TRANSACTION). They are piggybacked as the first statement of the request
+that runs the statement, so they cost no extra round trip.
+
+Both options accept a dict of name/value pairs or a preformatted
+'name=value;' string.
+"""
+
+from sqlalchemy import exc, util
+
+SESSION_BAND_KEY = 'teradata_query_band'
+
+
+def format_query_band(band):
+    """
+    Returns the 'name=value;...' form of band, which may be a dict
+    or an already formatted string. None and empty bands give None.
+    """
+    if not band:
+        return None
+    if isinstance(band, util.string_types):
+        return band if band.endswith(';') else band + ';'
+
+    pairs = []
+    for name, value in band.items():
+        if value is None:
+            continue
+        name, value = util.text_type(name), util.text_type(value)
+        for s in (name, value):
+            if ';' in s or '=' in s:
+                raise exc.ArgumentError(
+                    "Query band names and values cannot contain ';' or '=': %r" % s)
+        pairs.append('%s=%s;' % (name, value))
+    return ''.join(pairs) or None
+
+
+def set_query_band_sql(band, scope):
+    """
+    Returns the SET QUERY_BAND statement for a formatted band, where scope
+    is 'SESSION' or 'TRANSACTION'. A band of None removes the band.
+    """
+    if band is None:
+        return 'SET QUERY_BAND = NONE FOR %s' % scope
+    return "SET QUERY_BAND = '%s' FOR %s" % (band.replace("'", "''"), scope)
@@ -0,0 +1,110 @@
+# sqlalchemy_teradata/restrictedwords.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+The reserved words of the connected server, read from dbc.RestrictedWordsV.
+
+The identifier preparer quotes the identifiers that are reserved words. On
+its first connection the dialect reads the reserved words of the server
+version, which it quotes on top of the built-in set of base.ReservedWords,
+and saves them to a file in cache_dir named after the version, so that
+later processes read the file instead:
+
+    engine = create_engine('teradata://...',
+                           restricted_words_cache='/var/cache/app/teradata')
+
+cache_dir defaults to ~/.cache/sqlalchemy_teradata; restricted_words_cache=False
+does not use a file, and load_restricted_words=False keeps the built-in
+set of base.ReservedWords. The built-in set is also used when the words
+cannot be read.
+"""
+
+import json
+import os
+
+from sqlalchemy import exc
+from sqlalchemy.sql import select, text, column
+
+FORMAT = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sqlalchemy_teradata')
+
+# R for Teradata reserved words; nonreserved (N) and future reserved (F)
+# words can be used as identifiers
+RESERVED_CATEGORIES = ('R',)
+
+
+def cache_path(cache_dir, server_version):
+    return os.path.join(cache_dir, 'restricted_words-{}.json'.format(server_version))
+
+
+def read_cache(path, server_version):
+    """
+    The words saved at path for server_version, or None.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if data.get('format') != FORMAT or data.get('server_version') != server_version:
+        return None
+    return set(data['words'])
+
+
+def write_cache(path, server_version, words):
+    """
+    Saves words at path; a cache that cannot be written is skipped.
+    """
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(tmp, 'w') as f:
+            json.dump({'format': FORMAT, 'server_version': server_version,
+                       'words': sorted(words)}, f)
+        os.rename(tmp, path)
+    except (IOError, OSError):
+        pass
+
+
+def query_restricted_words(connection):
+    """
+    Reads the reserved words from dbc.RestrictedWordsV, in lower case.
+    """
+    dialect = connection.dialect
+    stmt = select([column('restricted_word')],
+                  from_obj=[text('dbc.RestrictedWordsV')]).where(
+                    text('category IN ({})'.format(
+                        ', '.join("'%s'" % c for c in RESERVED_CATEGORIES))))
+    res = connection.execute(dialect._dictionary_query(stmt)).fetchall()
+    return set(row[0].strip().lower() for row in res)
+
+
+def load_restricted_words(connection, server_version, cache_dir=None):
+    """
+    The reserved words of server_version from the cache in cache_dir
+    (the default directory if None, no cache if False), or else from the
+    server, saving them to the cache. None if they cannot be read.
+    """
+    if cache_dir is None:
+        cache_dir = DEFAULT_CACHE_DIR
+    path = cache_path(cache_dir, server_version) if cache_dir else None
+    if path is not None:
+        words = read_cache(path, server_version)
+        if words is not None:
+            return words
+
+    try:
+        words = query_restricted_words(connection)
+    except exc.DBAPIError:
+        return None
+    if not words:
+        return None
+    if path is not None:
+        write_cache(path, server_version, words)
+    return words
@@ -0,0 +1,167 @@
+# sqlalchemy_teradata/snapshot.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+A reflection snapshot keeps the reflected metadata of the tables of a
+schema in a file, so that processes reflecting the same tables at every
+start do not have to query the data dictionary table by table:
+
+    from sqlalchemy_teradata.snapshot import ReflectionSnapshot
+
+    snapshot = ReflectionSnapshot('/var/cache/app/reflection.snapshot')
+    snapshot.load(engine)
+    meta.reflect(engine)
+
+load() reads the file and checks it against the LastAlterTimeStamp of the
+tables in dbc.TablesV, in one query; the tables altered, created or
+dropped since are reflected again (or removed) and the file is rewritten.
+The snapshot is then installed on the dialect, which answers get_columns,
+get_pk_constraint, get_indexes, get_foreign_keys and get_unique_constraints
+for the tables of the snapshot without querying the database.
+
+The file is gzipped JSON of plain data, the columns as their dictionary
+rows; a file that cannot be read as a snapshot is reflected again.
+"""
+
+import copy
+import gzip
+import json
+import os
+
+from sqlalchemy import util
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import select, and_, text, column
+
+FORMAT = 2
+
+METHODS = ('get_columns', 'get_pk_constraint', 'get_indexes', 'get_foreign_keys',
+           'get_unique_constraints')
+
+
+class ReflectionSnapshot(object):
+    """
+    The reflected metadata of the tables of schema (the default schema
+    if None), or of the given tables only, saved at path.
+    """
+
+    def __init__(self, path, schema=None, tables=None):
+        self.path = path
+        self.schema = schema
+        self.tables = set(tables) if tables is not None else None
+        self._schema = None
+        self._dialect = None
+        self._entries = {}
+
+    def _read(self, dialect):
+        # whatever is wrong with the file, the tables are reflected again
+        try:
+            with gzip.open(self.path, 'rb') as f:
+                data = json.loads(f.read().decode('utf-8'))
+            if data['format'] != FORMAT or data['schema'] != self._schema or\
+                            data['server_version'] != dialect.server_version_info:
+                return {}
+            entries = data['tables']
+            for entry in entries.values():
+                if 'timestamp' not in entry or not all(m in entry for m in METHODS):
+                    return {}
+                # rows the dialect cannot read fail here rather than later
+                for row in entry['get_columns']:
+                    dialect._get_column_info(row)
+            return entries
+        except Exception:
+            return {}
+
+    def save(self, dialect):
+        tmp = self.path + '.tmp'
+        data = json.dumps({'format': FORMAT, 'schema': self._schema,
+                           'server_version': dialect.server_version_info,
+                           'tables': self._entries}, default=util.text_type)
+        with gzip.open(tmp, 'wb') as f:
+            f.write(data.encode('utf-8'))
+        os.rename(tmp, self.path)
+
+    def _timestamps(self, connection, schema):
+        dialect = connection.dialect
+        stmt = select([column('TableName'), column('LastAlterTimeStamp')],
+                      from_obj=[text('dbc.TablesV')]).where(
+                        and_(text('DatabaseName = :schema'),
+                             text("TableKind IN ('T', 'O', 'V')")))
+        res = connection.execute(dialect._dictionary_query(stmt), schema=schema).fetchall()
+        return dict((dialect.normalize_name(r[0]), util.text_type(r[1])) for r in res)
+
+    def load(self, bind):
+        """
+        Loads the snapshot, brings it up to date and installs it on the
+        dialect of bind (an Engine or Connection). Returns the names of the
+        tables reflected again.
+        """
+        conn = bind.connect() if isinstance(bind, Engine) else bind
+        try:
+            dialect = conn.dialect
+            if dialect.server_version_info is None:
+                dialect.initialize(conn)
+            self._schema = self.schema or dialect.default_schema_name
+            self._dialect = dialect
+            dialect.reflection_snapshot = None
+            self._entries = self._read(dialect)
+
+            timestamps = self._timestamps(conn, self._schema)
+            if self.tables is not None:
+                timestamps = dict((t, ts) for t, ts in timestamps.items() if t in self.tables)
+
+            dropped = set(self._entries) - set(timestamps)
+            changed = sorted(t for t, ts in timestamps.items()
+                             if t not in self._entries or self._entries[t]['timestamp'] != ts)
+            for name in dropped:
+                del self._entries[name]
+            for name in changed:
+                self._entries[name] = self._reflect(conn, name, timestamps[name])
+
+            if changed or dropped or not os.path.exists(self.path):
+                self.save(dialect)
+            dialect.reflection_snapshot = self
+            return changed
+        finally:
+            if conn is not bind:
+                conn.close()
+
+    def _reflect(self, connection, table_name, timestamp):
+        dialect = connection.dialect
+        entry, info_cache = {'timestamp': timestamp}, {}
+        for method in METHODS:
+            if method == 'get_columns':
+                # the types are kept as the dictionary values they come from
+                entry[method] = dialect._get_column_rows(connection, table_name,
+                                                         self._schema)
+            else:
+                entry[method] = getattr(dialect, method)(connection, table_name,
+                                                         self._schema, info_cache=info_cache)
+        return entry
+
+    def get(self, method, table_name, schema):
+        """
+        The result of method for a table, or None if not in the snapshot.
+        """
+        if schema != self._schema:
+            return None
+        entry = self._entries.get(table_name)
+        if entry is None:
+            return None
+        if method == 'get_columns':
+            return [self._dialect._get_column_info(row) for row in entry[method]]
+        # callers may alter the reflected dicts
+        return copy.deepcopy(entry[method])
+
+    def invalidate(self, table_name=None):
+        """
+        Drops a table, or all of them, from the snapshot in memory so it is
+        reflected from the database again.
+        """
+        if table_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(table_name, None)
@@ -0,0 +1,86 @@
+# sqlalchemy_teradata/sqlshapes.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+The distinct SQL shapes executed on an engine.
+
+The Teradata request cache keeps the plans of requests by their text, so
+requests that differ only in their literals are parsed and optimized again
+each time. With track_sql_shapes, the dialect records every request it
+sends by its shape, its text with the literals replaced by '?', and counts
+the executions and the distinct texts of each shape:
+
+    engine = create_engine('teradata://...', track_sql_shapes=True)
+    ...
+    for shape in engine.dialect.sql_shapes.report():
+        print(shape.executions, shape.texts, shape.sql)
+
+A shape with as many texts as executions never hits the request cache;
+parameterize_literals=True binds the literals the dialect renders itself
+(TOP n and literal_binds compilations) instead.
+"""
+
+import collections
+import re
+import threading
+
+# string literals, and numbers that are not part of identifiers
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w$#.\"])[-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?\b")
+_SPACES = re.compile(r'\s+')
+
+ShapeStats = collections.namedtuple('ShapeStats', ['sql', 'executions', 'texts'])
+
+
+def sql_shape(sql):
+    """
+    The text of sql with its literals replaced by '?' and its whitespace
+    collapsed.
+    """
+    return _SPACES.sub(' ', _LITERALS.sub('?', sql)).strip()
+
+
+class SQLShapes(object):
+    """
+    The executions and distinct texts of the shapes of the requests sent
+    on an engine, for at most max_shapes shapes; the requests of further
+    shapes are counted in overflow.
+    """
+
+    def __init__(self, max_shapes=10000):
+        self.max_shapes = max_shapes
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._shapes = {}
+            self.overflow = 0
+
+    def __len__(self):
+        return len(self._shapes)
+
+    def record(self, sql):
+        shape = sql_shape(sql)
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                if len(self._shapes) >= self.max_shapes:
+                    self.overflow += 1
+                    return
+                # the hashes of the texts are enough to count them
+                stats = self._shapes[shape] = [0, set()]
+            stats[0] += 1
+            stats[1].add(hash(sql))
+
+    def report(self):
+        """
+        The ShapeStats of the shapes, most executed first.
+        """
+        with self._lock:
+            shapes = [ShapeStats(sql, n, len(texts))
+                      for sql, (n, texts) in self._shapes.items()]
+        return sorted(shapes, key=lambda s: (-s.executions, s.sql))
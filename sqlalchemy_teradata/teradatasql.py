@@ -0,0 +1,64 @@
+# sqlalchemy_teradata/teradatasql.py
+# Copyright (C) 2015-2016 by Teradata
+# <see AUTHORS file>
+#
+# This module is part of sqlalchemy-teradata and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+The teradatasql backend, the native Teradata SQL driver for Python:
+
+    engine = create_engine('teradata+teradatasql://user:pw@host/database')
+
+teradatasql talks to the database directly, without ODBC and a driver
+manager on the host, and binds and returns native Python values. Query
+parameters of the URL are passed through as connection parameters, e.g.
+?logmech=LDAP or ?tmode=ANSI.
+"""
+
+from __future__ import absolute_import
+
+from sqlalchemy import types as sqltypes
+from sqlalchemy_teradata.dialect import TeradataDialect
+
+
+class _TeradataSQLBinary(sqltypes.LargeBinary):
+
+    def bind_processor(self, dialect):
+        # teradatasql binds bytes only, not bytearray or memoryview
+        def process(value):
+            if value is not None and not isinstance(value, bytes):
+                value = bytes(value)
+            return value
+        return process
+
+
+class TeradataDialect_teradatasql(TeradataDialect):
+
+    driver = 'teradatasql'
+    supports_sane_multi_rowcount = True
+
+    colspecs = TeradataDialect.colspecs.copy()
+    colspecs[sqltypes.LargeBinary] = _TeradataSQLBinary
+
+    @classmethod
+    def dbapi(cls):
+        import teradatasql
+        return teradatasql
+
+    def create_connect_args(self, url):
+        opts = url.translate_connect_args(username='user', port='dbs_port')
+        opts.update(url.query)
+        # connection parameters are given to the driver as strings
+        return ([None], dict((k, str(v)) for k, v in opts.items()))
+
+    def do_executemany(self, cursor, statement, parameters, context=None, batch=None):
+        if self.sql_shapes is not None:
+            self.sql_shapes.record(statement)
+        if context is not None:
+            statement = context._pre_request(cursor, statement, parameters[0])
+        # executemany is always sent as a single request by this driver
+        cursor.executemany(statement, parameters)
+
+
+dialect = TeradataDialect_teradatasql
@@ -5,6 +5,10 @@
 # This module is part of sqlalchemy-teradata and is released under
 # the MIT License: http://www.opensource.org/licenses/mit-license.php
 
+import datetime
+import decimal
+
+from sqlalchemy import exc, processors, util
 from sqlalchemy.sql import sqltypes
 
 class BYTEINT(sqltypes.Integer):
@@ -71,9 +75,94 @@ class TIMESTAMP(sqltypes.TIMESTAMP):
         self.precision = precision
 
 
+# the fields of the interval types, in microseconds for day-time intervals
+# and in months for year-month intervals
+_SECOND = 10 ** 6
+_MINUTE = 60 * _SECOND
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
+_INTERVAL_FIELDS = {
+    'interval_year': (12,),
+    'interval_year_to_month': (12, 1),
+    'interval_month': (1,),
+    'interval_day': (_DAY,),
+    'interval_day_to_hour': (_DAY, _HOUR),
+    'interval_day_to_minute': (_DAY, _HOUR, _MINUTE),
+    'interval_day_to_second': (_DAY, _HOUR, _MINUTE, _SECOND),
+    'interval_hour': (_HOUR,),
+    'interval_hour_to_minute': (_HOUR, _MINUTE),
+    'interval_hour_to_second': (_HOUR, _MINUTE, _SECOND),
+    'interval_minute': (_MINUTE,),
+    'interval_minute_to_second': (_MINUTE, _SECOND),
+    'interval_second': (_SECOND,),
+}
+
+
+def _interval_parser(fields, months):
+    """
+    The parser of the string form of an interval of fields, e.g.
+    '-3 04:05:06.5' for DAY TO SECOND, to a timedelta, or to a number of
+    months for year-month intervals.
+    """
+    seconds = fields[-1] == _SECOND
+
+    def parse(value):
+        value = str(value).strip()
+        sign = 1
+        if value[:1] == '-':
+            sign, value = -1, value[1:].lstrip()
+        parts = value.replace(' ', ':').replace('-', ':').split(':')
+        total = 0
+        if seconds:
+            whole, _, frac = parts.pop().partition('.')
+            total = int(whole or 0) * _SECOND + int(frac[:6].ljust(6, '0'))
+        for part, field in zip(parts, fields):
+            total += int(part) * field
+        if months:
+            return sign * total
+        return datetime.timedelta(microseconds=sign * total)
+    return parse
+
+
+def _interval_formatter(fields, months, frac_precision):
+    """
+    The formatter of timedeltas, or numbers of months, to the string form
+    of an interval of fields. Fractions of seconds are truncated to
+    frac_precision digits; a value not whole in the last field is an error.
+    """
+    seps = [' ' if field == _DAY else '-' if months else ':' for field in fields[:-1]]
+    seconds = fields[-1] == _SECOND
+    if frac_precision is None:
+        frac_precision = 6
+
+    def format(value):
+        if months:
+            total = value
+        else:
+            total = (value.days * 86400 + value.seconds) * _SECOND + value.microseconds
+        res = '-' if total < 0 else ''
+        total = abs(total)
+        for i, field in enumerate(fields):
+            n, total = divmod(total, field)
+            res += ('%d' if i == 0 else seps[i - 1] + '%02d') % n
+        if seconds and frac_precision:
+            res += '.%0*d' % (frac_precision, total // 10 ** (6 - frac_precision))
+        elif total and not seconds:
+            raise ValueError('%r is not a whole number of the last field of the interval'
+                             % (value,))
+        return res
+    return format
+
+
 class _TDInterval(sqltypes.Interval):
 
-    """ Base class for teradata interval sqltypes."""
+    """ Base class for teradata interval sqltypes.
+
+    Values of the day-time intervals are timedeltas, and of the year-month
+    intervals (YEAR, YEAR TO MONTH and MONTH) numbers of months. They are
+    bound, and parsed from the driver, in the string form of the type.
+    """
 
     def __init__(self, precision=None, frac_precision=None, **kwargs):
 
@@ -82,6 +171,35 @@ class _TDInterval(sqltypes.Interval):
 
         super(_TDInterval, self).__init__(**kwargs)
 
+    @property
+    def _months(self):
+        return self.__visit_name__ in ('interval_year', 'interval_year_to_month',
+                                       'interval_month')
+
+    @property
+    def python_type(self):
+        return int if self._months else datetime.timedelta
+
+    def bind_processor(self, dialect):
+        format = _interval_formatter(_INTERVAL_FIELDS[self.__visit_name__], self._months,
+                                     self.frac_precision)
+
+        def process(value):
+            if value is None or isinstance(value, util.string_types):
+                return value
+            return format(value)
+        return process
+
+    def result_processor(self, dialect, coltype):
+        parse = _interval_parser(_INTERVAL_FIELDS[self.__visit_name__], self._months)
+        timedelta = datetime.timedelta
+
+        def process(value):
+            if value is None or value.__class__ is timedelta:
+                return value
+            return parse(value)
+        return process
+
 
 class IntervalYear(_TDInterval, sqltypes.Interval):
 
@@ -376,4 +494,175 @@ class CLOB(sqltypes.CLOB):
         self.multiplier=multiplier
 
 class BLOB(sqltypes.LargeBinary):
-        pass
+
+    def __init__(self, length=None, multiplier=None, **kwargs):
+
+        """Construct a Blob
+
+        :param length: Optional length for blob, which cannot exceed 2097088000
+        bytes. If no length is specified then the maximum is used.
+
+        :param multiplier: Either 'K', 'M', or 'G', for a length of nK (n < 2047937),
+        nM (n < 1999) or nG (n must be 1) bytes.
+
+        Large values can be read and written in chunks with
+        sqlalchemy_teradata.lob.
+        """
+        super(BLOB, self).__init__(length=length, **kwargs)
+        self.multiplier = multiplier
+
+
+class PERIOD(sqltypes.TypeEngine):
+
+    """ Teradata PERIOD(DATE), PERIOD(TIME) and PERIOD(TIMESTAMP) types.
+
+    Values are (begin, end) tuples of dates, times or datetimes.
+    """
+
+    __visit_name__ = 'PERIOD'
+
+    def __init__(self, item_type=sqltypes.Date):
+
+        """ Construct a PERIOD
+
+        :param item_type: the type of the beginning and end of the period, a
+        Date, Time or DateTime (e.g. TIMESTAMP(6, timezone=True)) type or
+        class.
+        """
+        if isinstance(item_type, type):
+            item_type = item_type()
+        if not isinstance(item_type, (sqltypes.Date, sqltypes.Time, sqltypes.DateTime)):
+            raise exc.ArgumentError('PERIOD takes a DATE, TIME or TIMESTAMP type, '
+                                    'got %r' % (item_type,))
+        self.item_type = item_type
+
+    @property
+    def python_type(self):
+        return tuple
+
+    def _parse_item(self):
+        if isinstance(self.item_type, sqltypes.DateTime):
+            return str_to_datetime
+        if isinstance(self.item_type, sqltypes.Time):
+            return str_to_time
+        return str_to_date
+
+    def bind_processor(self, dialect):
+        # "('begin', 'end')", the string form of the period
+        def process(value):
+            if value is None or isinstance(value, util.string_types):
+                return value
+            begin, end = [str(v) for v in value]
+            return "('%s', '%s')" % (begin, end)
+        return process
+
+    def result_processor(self, dialect, coltype):
+        parse = self._parse_item()
+
+        def process(value):
+            if value is None or value.__class__ is tuple:
+                return value
+            begin, end = str(value).strip('()').split(',')
+            return (parse(begin.strip(" '")), parse(end.strip(" '")))
+        return process
+
+
+# The result processors of the dialect (see TeradataDialect.colspecs). The
+# drivers return Decimal, date, datetime and time values, which are left
+# alone; with native_types=False on the dialect, for drivers returning
+# the string forms of these types (and the number forms of decimals), they
+# are parsed here instead.
+
+_timezones = {}
+
+
+def _tzinfo(offset):
+    """
+    The tzinfo of a '+HH:MI' offset, or None before Python 3.
+    """
+    tz = _timezones.get(offset)
+    if tz is None and hasattr(datetime, 'timezone'):
+        minutes = int(offset[1:3]) * 60 + int(offset[4:6])
+        tz = _timezones[offset] = datetime.timezone(
+                datetime.timedelta(minutes=-minutes if offset[0] == '-' else minutes))
+    return tz
+
+
+def _time_args(value):
+    """
+    The hour, minute, second, microsecond and tzinfo of
+    'HH:MI:SS[.ffffff][+HH:MI]'.
+    """
+    tzinfo = None
+    if len(value) > 8 and value[-6] in '+-':
+        tzinfo = _tzinfo(value[-6:])
+        value = value[:-6]
+    micro = int(value[9:15].ljust(6, '0')) if len(value) > 9 else 0
+    return int(value[0:2]), int(value[3:5]), int(value[6:8]), micro, tzinfo
+
+
+def str_to_date(value):
+    if value is None or value.__class__ is datetime.date:
+        return value
+    return datetime.date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+def str_to_datetime(value):
+    if value is None or value.__class__ is datetime.datetime:
+        return value
+    if len(value) == 10:
+        return datetime.datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    return datetime.datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                             *_time_args(value[11:]))
+
+
+def str_to_time(value):
+    if value is None or value.__class__ is datetime.time:
+        return value
+    return datetime.time(*_time_args(value))
+
+
+def to_decimal_processor(scale):
+    """
+    Converts the string and number forms of decimals, formatting
+    floats to scale digits.
+    """
+    fmt = '%%.%df' % scale
+    Decimal = decimal.Decimal
+
+    def process(value):
+        if value is None or value.__class__ is Decimal:
+            return value
+        if value.__class__ is float:
+            return Decimal(fmt % value)
+        return Decimal(value)
+    return process
+
+
+class _TDNumeric(sqltypes.Numeric):
+
+    def result_processor(self, dialect, coltype):
+        if not self.asdecimal:
+            # float(value) of any form, in C when available
+            return processors.to_float
+        if dialect.native_types:
+            return None
+        return to_decimal_processor(self._effective_decimal_return_scale)
+
+
+class _TDDate(sqltypes.Date):
+
+    def result_processor(self, dialect, coltype):
+        return None if dialect.native_types else str_to_date
+
+
+class _TDDateTime(sqltypes.DateTime):
+
+    def result_processor(self, dialect, coltype):
+        return None if dialect.native_types else str_to_datetime
+
+
+class _TDTime(sqltypes.Time):
+
+    def result_processor(self, dialect, coltype):
+        return None if dialect.native_types else str_to_time
@@ -2,4 +2,12 @@ from sqlalchemy import *
 from sqlalchemy.dialects import registry
 
 registry.register("teradata", "sqlalchemy_teradata.dialect", "TeradataDialect")
+registry.register("teradata.teradatasql", "sqlalchemy_teradata.teradatasql", "TeradataDialect_teradatasql")
+registry.register("teradata.async", "sqlalchemy_teradata.aio", "TeradataAsyncDialect")
+
+# keep the reserved words read from test servers out of the user's cache
+import tempfile
+from sqlalchemy_teradata import restrictedwords
+restrictedwords.DEFAULT_CACHE_DIR = tempfile.mkdtemp(prefix='sqlalchemy_teradata_test')
+
 from sqlalchemy.testing.plugin.pytestplugin import *
@@ -4,7 +4,7 @@ from sqlalchemy.types import (Integer, SmallInteger, BigInteger, Numeric,
                 Float, DateTime, Date, String, Text, Unicode, UnicodeText,
                 Time, LargeBinary, Boolean, Interval,
                 DATE, BOOLEAN, DATETIME, BIGINT, SMALLINT, INTEGER, FLOAT, REAL,
-                TEXT, NVARCHAR, NCHAR)
+                TEXT, NVARCHAR, NCHAR, TypeDecorator)
 from sqlalchemy_teradata.types import (CHAR, VARCHAR, CLOB, DECIMAL, NUMERIC,
                                        VARCHAR, TIMESTAMP, TIME)
 from sqlalchemy.testing import fixtures
@@ -111,3 +111,38 @@ class TestCompileTypes(fixtures.TestBase):
     def test_timezones(self):
         assert self.comp.process(TIME(1, True)) == 'TIME(1) WITH TIME ZONE'
         assert self.comp.process(TIMESTAMP(0, True)) == 'TIMESTAMP(0) WITH TIME ZONE'
+
+
+class TestTypeCache(fixtures.TestBase):
+
+    def setup(self):
+        self.comp = tdtc(tdd())
+        tdtc._cache.clear()
+
+    def test_cached(self):
+        assert self.comp.process(VARCHAR(10, 'UNICODE')) == 'VARCHAR(10) CHAR SET UNICODE'
+        assert self.comp.process(VARCHAR(10, 'UNICODE')) == 'VARCHAR(10) CHAR SET UNICODE'
+        assert len(tdtc._cache) == 1
+
+        # any parameter of the DDL is in the key
+        assert self.comp.process(VARCHAR(10)) == 'VARCHAR(10)'
+        assert self.comp.process(VARCHAR(20, 'UNICODE')) == 'VARCHAR(20) CHAR SET UNICODE'
+        assert self.comp.process(Numeric(10, 2)) == 'NUMERIC(10, 2)'
+        assert self.comp.process(Numeric(10, 4)) == 'NUMERIC(10, 4)'
+        assert self.comp.process(TIMESTAMP(6, True)) == 'TIMESTAMP(6) WITH TIME ZONE'
+        assert self.comp.process(TIMESTAMP(6)) == 'TIMESTAMP(6)'
+        assert self.comp.process(CLOB(1, multiplier='K')) == 'CLOB(1K)'
+        assert self.comp.process(CLOB(1, multiplier='M')) == 'CLOB(1M)'
+        assert len(tdtc._cache) == 9
+
+    def test_not_cached(self):
+        class Code(TypeDecorator):
+            impl = String
+        assert self.comp.process(Code(5)) == 'VARCHAR(5)'
+        # only its impl is cached
+        assert list(tdtc._cache)[0][0] is String
+
+        # keywords change the DDL
+        assert self.comp.process(TIME(), precision=2) == 'TIME(2)'
+        assert self.comp.process(TIME()) == 'TIME(6)'
+        assert len(tdtc._cache) == 2
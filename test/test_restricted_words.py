@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+
+from sqlalchemy_teradata import emulator, restrictedwords
+from sqlalchemy_teradata.base import ReservedWords
+from sqlalchemy import create_engine
+from sqlalchemy.testing import fixtures
+
+
+class TestRestrictedWords(fixtures.TestBase):
+
+    def setup(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.engines = []
+        emulator.stats.reset()
+
+    def teardown(self):
+        for engine in self.engines:
+            engine.dispose()
+        shutil.rmtree(self.cache_dir)
+
+    def _engine(self, system='words', **kw):
+        kw.setdefault('restricted_words_cache', self.cache_dir)
+        engine = create_engine('teradata://user:pass@' + system, module=emulator, **kw)
+        self.engines.append(engine)
+        return engine
+
+    def _queries(self):
+        return len([s for s in emulator.stats.statements if 'RestrictedWordsV' in s])
+
+    def test_load(self):
+        engine = self._engine()
+        preparer = engine.dialect.identifier_preparer
+        assert preparer.quote('qualify') == 'qualify'
+        assert preparer.quote('user') == '"user"'
+
+        engine.connect().close()
+        assert self._queries() == 1
+        assert preparer.quote('qualify') == '"qualify"'
+        assert preparer.quote('user') == '"user"'
+        # nonreserved words are not quoted
+        assert preparer.quote('name') == 'name'
+        assert os.path.exists(restrictedwords.cache_path(self.cache_dir, '16.20.00.00'))
+
+    def test_cache(self):
+        self._engine().connect().close()
+        engine = self._engine()
+        engine.connect().close()
+        assert self._queries() == 1
+        assert engine.dialect.identifier_preparer.quote('qualify') == '"qualify"'
+
+        # another server version reads its own words
+        engine = self._engine('words_15', connect_args={'version': '15.10.00.00'})
+        engine.connect().close()
+        assert self._queries() == 2
+        assert os.path.exists(restrictedwords.cache_path(self.cache_dir, '15.10.00.00'))
+
+    def test_builtin_kept(self):
+        # words the server does not list as reserved are still quoted
+        restrictedwords.write_cache(restrictedwords.cache_path(self.cache_dir, '16.20.00.00'),
+                                    '16.20.00.00', set(['qualify']))
+        engine = self._engine()
+        engine.connect().close()
+        preparer = engine.dialect.identifier_preparer
+        assert preparer.reserved_words == ReservedWords | set(['qualify'])
+        for word in ('qualify', 'value', 'title', 'password'):
+            assert preparer.quote(word) == '"%s"' % word
+
+    def test_no_cache(self):
+        self._engine(restricted_words_cache=False).connect().close()
+        self._engine(restricted_words_cache=False).connect().close()
+        assert self._queries() == 2
+        assert os.listdir(self.cache_dir) == []
+
+    def test_builtin(self):
+        engine = self._engine(load_restricted_words=False)
+        engine.connect().close()
+        assert self._queries() == 0
+        assert engine.dialect.identifier_preparer.reserved_words == ReservedWords
+
+    def test_offline(self):
+        conn = emulator.connect(system='words_offline', username='user')
+        try:
+            conn._conn.execute('DROP TABLE dbc.RestrictedWordsV')
+            engine = self._engine('words_offline')
+            engine.connect().close()
+            assert engine.dialect.identifier_preparer.reserved_words == ReservedWords
+            assert os.listdir(self.cache_dir) == []
+        finally:
+            conn.close()
@@ -5,7 +5,9 @@ from sqlalchemy_teradata.types import ( IntervalYear, IntervalYearToMonth, Inter
                                   IntervalDayToSecond, IntervalHour, IntervalHourToMinute,
                                   IntervalHourToSecond, IntervalMinute, IntervalMinuteToSecond,
                                   IntervalSecond,
-                                  BYTEINT)
+                                  BYTEINT, PERIOD, TIMESTAMP)
+from sqlalchemy import exc
+from sqlalchemy.types import Time, Integer
 
 from sqlalchemy.testing import fixtures
 
@@ -73,3 +75,21 @@ class TestCompileTDInterval(fixtures.TestBase):
          assert self.comp.process(IntervalSecond(prec, fsec)) == \
              'INTERVAL SECOND({}, {})'.format(prec, fsec)
 
+
+
+class TestCompilePeriod(fixtures.TestBase):
+
+   def setup(self):
+     self.comp = tdtc(tdd)
+
+   def test_period(self):
+     assert self.comp.process(PERIOD()) == 'PERIOD(DATE)'
+     assert self.comp.process(PERIOD(Time)) == 'PERIOD(TIME(6))'
+     assert self.comp.process(PERIOD(TIMESTAMP(0, True))) == \
+                                        'PERIOD(TIMESTAMP(0) WITH TIME ZONE)'
+     try:
+       PERIOD(Integer)
+     except exc.ArgumentError:
+       pass
+     else:
+       assert False